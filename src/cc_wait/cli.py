@@ -4,10 +4,15 @@ from __future__ import annotations
 
 import argparse
 import sys
+from typing import TYPE_CHECKING, cast
 
-from cc_wait.daemon import POLL_INTERVAL, run_daemon
-from cc_wait.oauth import fetch_usage_status
-from cc_wait.tmux import find_rate_limited_panes, get_claude_panes, is_tmux_available
+from cc_wait.formatting import format_duration
+
+if TYPE_CHECKING:
+    from cc_wait.daemon import ContinueStrategy
+
+# Subcommand dependencies (httpx via oauth, the daemon) are imported inside the
+# command functions so `cc-wait --help` and unrelated commands start fast.
 
 
 def format_bar(percent: float, width: int = 10) -> str:
@@ -17,21 +22,12 @@ def format_bar(percent: float, width: int = 10) -> str:
     return "█" * filled + "░" * empty
 
 
-def format_duration(seconds: int) -> str:
-    """Format seconds as human-readable duration."""
-    if seconds < 60:
-        return f"{seconds}s"
-    elif seconds < 3600:
-        mins = seconds // 60
-        return f"{mins}m"
-    else:
-        hours = seconds // 3600
-        mins = (seconds % 3600) // 60
-        return f"{hours}h {mins}m" if mins else f"{hours}h"
-
-
 def cmd_status(args: argparse.Namespace) -> int:
     """Show current rate limit status."""
+    from datetime import UTC, datetime
+
+    from cc_wait.oauth import fetch_usage_status
+
     status = fetch_usage_status()
 
     if status is None:
@@ -39,17 +35,22 @@ def cmd_status(args: argparse.Namespace) -> int:
         print("Make sure you're logged into Claude Code (check ~/.claude/.credentials.json)")
         return 1
 
+    # One clock read so all windows count down from the same instant
+    now = datetime.now(UTC)
+
     # 5-hour window
     five = status.five_hour
     bar = format_bar(five.utilization)
-    resets = format_duration(five.resets_in_seconds) if five.resets_in_seconds else "N/A"
+    seconds = five.seconds_until_reset(now)
+    resets = format_duration(seconds) if seconds else "N/A"
     limited = " ⚠️ LIMITED" if five.is_limited else ""
     print(f"5-hour:  {five.utilization:5.1f}% {bar}  resets in {resets}{limited}")
 
     # 7-day window
     seven = status.seven_day
     bar = format_bar(seven.utilization)
-    resets = format_duration(seven.resets_in_seconds) if seven.resets_in_seconds else "N/A"
+    seconds = seven.seconds_until_reset(now)
+    resets = format_duration(seconds) if seconds else "N/A"
     limited = " ⚠️ LIMITED" if seven.is_limited else ""
     print(f"7-day:   {seven.utilization:5.1f}% {bar}  resets in {resets}{limited}")
 
@@ -57,7 +58,8 @@ def cmd_status(args: argparse.Namespace) -> int:
     if status.seven_day_opus:
         opus = status.seven_day_opus
         bar = format_bar(opus.utilization)
-        resets = format_duration(opus.resets_in_seconds) if opus.resets_in_seconds else "N/A"
+        seconds = opus.seconds_until_reset(now)
+        resets = format_duration(seconds) if seconds else "N/A"
         limited = " ⚠️ LIMITED" if opus.is_limited else ""
         print(f"Opus:    {opus.utilization:5.1f}% {bar}  resets in {resets}{limited}")
 
@@ -66,6 +68,8 @@ def cmd_status(args: argparse.Namespace) -> int:
 
 def cmd_detect(args: argparse.Namespace) -> int:
     """Detect rate-limited Claude sessions in tmux."""
+    from cc_wait.tmux import is_tmux_available, scan_claude_panes
+
     if not is_tmux_available():
         print("Error: tmux not available or no sessions running.")
         return 1
@@ -73,38 +77,44 @@ def cmd_detect(args: argparse.Namespace) -> int:
     print("Scanning tmux panes for Claude sessions...")
     print()
 
-    all_panes = get_claude_panes()
+    all_panes = scan_claude_panes()
     if not all_panes:
         print("No Claude sessions found in tmux.")
         return 0
 
     print(f"Found {len(all_panes)} Claude session(s):")
 
-    limited_panes = find_rate_limited_panes()
-    limited_ids = {p.pane_id for p in limited_panes}
-
+    # Single pass: print each pane and collect manual-continue hints as we go
+    hints = []
     for pane in all_panes:
-        if pane.pane_id in limited_ids:
+        if pane.is_rate_limited:
             print(f"  ⚠️  {pane.pane_id} ({pane.session_name}): RATE LIMITED")
+            hints.append(f"  tmux send-keys -t {pane.pane_id} 'continue' Enter")
         else:
             print(f"  ✓  {pane.pane_id} ({pane.session_name}): OK")
 
     print()
-    print(f"Rate limited: {len(limited_panes)}")
+    print(f"Rate limited: {len(hints)}")
 
-    if limited_panes:
+    if hints:
         print()
         print("To manually continue these sessions:")
-        for pane in limited_panes:
-            print(f"  tmux send-keys -t {pane.pane_id} 'continue' Enter")
+        print("\n".join(hints))
 
     return 0
 
 
 def cmd_daemon(args: argparse.Namespace) -> int:
     """Run the rate limit monitor daemon."""
-    poll_interval = args.interval if hasattr(args, "interval") else POLL_INTERVAL
-    run_daemon(poll_interval=poll_interval)
+    from cc_wait.daemon import POLL_INTERVAL, STRATEGIES, STRATEGY, run_daemon
+
+    poll_interval = args.interval if getattr(args, "interval", None) is not None else POLL_INTERVAL
+    strategy = getattr(args, "strategy", None) or STRATEGY
+    if strategy not in STRATEGIES:
+        print(f"Error: unknown strategy {strategy!r} (choose from {', '.join(STRATEGIES)})")
+        return 2
+
+    run_daemon(poll_interval=poll_interval, strategy=cast("ContinueStrategy", strategy))
     return 0
 
 
@@ -128,8 +138,13 @@ def main() -> int:
         "-i",
         "--interval",
         type=int,
-        default=POLL_INTERVAL,
-        help=f"Poll interval in seconds (default: {POLL_INTERVAL})",
+        help="Poll interval in seconds (default: $CC_WAIT_POLL_INTERVAL or 60)",
+    )
+    daemon_parser.add_argument(
+        "-s",
+        "--strategy",
+        help="Which sessions to continue after a reset: blocked, detect, or all "
+        "(default: $CC_WAIT_STRATEGY or blocked)",
     )
 
     args = parser.parse_args()
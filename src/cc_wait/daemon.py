@@ -2,45 +2,120 @@
 
 from __future__ import annotations
 
+import atexit
+import json
 import os
+import re
 import sys
+import threading
 import time
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Literal, TextIO, cast, get_args
 
+from cc_wait.formatting import format_duration
 from cc_wait.oauth import UsageStatus, fetch_usage_status
 from cc_wait.tmux import (
-    capture_pane_content,
+    TmuxPane,
+    capture_panes_bulk,
     detect_rate_limit,
     get_claude_panes,
     is_tmux_available,
-    send_continue,
+    send_continue_many,
 )
 
 POLL_INTERVAL = int(os.environ.get("CC_WAIT_POLL_INTERVAL", "60"))
-DEBUG = os.environ.get("CC_WAIT_DEBUG", "").lower() in ("1", "true", "yes")
+MAX_IDLE_INTERVAL = 300  # Cap for the idle backoff while not rate limited
+HIGH_UTILIZATION = 90.0  # At or above this, poll at the normal interval even while idle
+MIN_POLL_INTERVAL = 5  # Floor so we never hammer the API once reset has passed
+TMUX_REPROBE_INTERVAL = 300.0  # Seconds between tmux probes while it is unavailable
+_TRUTHY = frozenset({"1", "true", "yes", "on", "y", "t"})
+DEBUG = os.environ.get("CC_WAIT_DEBUG", "").lower() in _TRUTHY
 DEBUG_LOG_PATH = Path.home() / ".claude" / "cc-wait-daemon.log"
+DEBUG_LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate to cc-wait-daemon.log.1 past this size
+DEBUG_LINES_PER_PANE = int(os.environ.get("CC_WAIT_DEBUG_LINES", "10"))
+
+# How to pick the sessions that get "continue" after a reset:
+#   blocked - panes showing the rate limit message, with the last-lines fallback
+#   detect  - only panes where detect_rate_limit() matches
+#   all     - every Claude pane, without capturing content
+ContinueStrategy = Literal["blocked", "detect", "all"]
+STRATEGIES: tuple[ContinueStrategy, ...] = get_args(ContinueStrategy)
+# Not validated here; RateLimitDaemon rejects unknown values
+STRATEGY = cast(ContinueStrategy, os.environ.get("CC_WAIT_STRATEGY", "blocked"))
+
+# History lines captured above the visible screen when checking panes at reset.
+# The message and menu sit at the bottom of the screen. The same in debug mode,
+# so turning on debugging doesn't change what gets detected; DEBUG_LINES_PER_PANE
+# bounds what is logged.
+CAPTURE_LINES = 20
+
+# Fallback indicators for panes detect_rate_limit() misses. Each group sets one
+# bit; the lookahead lets overlapping needles ("usage limit will reset") all match.
+_FALLBACK_RE = re.compile(
+    r"(?=(usage limit)|(limit will reset)|(hit your limit)|(resets)|(1\.)|(wait)|(upgrade))"
+)
+_USAGE_LIMIT, _WILL_RESET, _HIT_LIMIT, _RESETS, _MENU_ITEM, _WAIT, _UPGRADE = (
+    1 << i for i in range(7)
+)
+_FORMAT1 = _USAGE_LIMIT | _WILL_RESET  # "Claude usage limit reached ... limit will reset"
+_FORMAT2 = _HIT_LIMIT | _RESETS  # "You've hit your limit · resets"
+
+# Debug log file, opened on first write and kept open for the daemon's lifetime
+_debug_fp: TextIO | None = None
+
+
+def _emit(line: str) -> None:
+    """Write a line to stderr as bytes, bypassing the text layer when possible."""
+    # Look stderr up per call so redirected/captured streams are honored
+    stream = getattr(sys.stderr, "buffer", None)
+    if stream is None:
+        print(line, file=sys.stderr, flush=True)
+        return
+    stream.write(line.encode("utf-8", "replace") + b"\n")
+    stream.flush()
 
 
 def log(msg: str, *, debug_only: bool = False, to_file: bool = False) -> None:
     """Log a message with timestamp."""
     if debug_only and not DEBUG:
         return
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    line = f"[{timestamp}] {msg}"
-    print(line, file=sys.stderr, flush=True)
+    ts = time.time()
+    line = f"[{time.strftime('%H:%M:%S', time.localtime(ts))}] {msg}"
+    _emit(line)
 
-    # Also write to debug log file if requested
+    # Also write to debug log file if requested, stamped with the same time
     if to_file or DEBUG:
-        _write_debug_log(line)
+        _write_debug_log(msg, ts)
+
+
+def _open_debug_log() -> TextIO:
+    """Return the open debug log file, rotating it once it grows past the size cap."""
+    global _debug_fp
+    if _debug_fp is not None and _debug_fp.tell() >= DEBUG_LOG_MAX_BYTES:
+        _debug_fp.close()
+        _debug_fp = None
+        DEBUG_LOG_PATH.replace(DEBUG_LOG_PATH.with_name(DEBUG_LOG_PATH.name + ".1"))
+    if _debug_fp is None:
+        _debug_fp = open(DEBUG_LOG_PATH, "a", buffering=1)
+    return _debug_fp
+
+
+@atexit.register
+def _close_debug_log() -> None:
+    """Close the debug log file if it was opened."""
+    if _debug_fp is not None:
+        _debug_fp.close()
 
 
-def _write_debug_log(msg: str) -> None:
-    """Append message to debug log file."""
+def _write_debug_log(msg: str, ts: float | None = None) -> None:
+    """Append message to debug log file, timestamped with ts (default: now).
+
+    Multi-line messages are written in one call with the timestamp on the first line.
+    """
     try:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(DEBUG_LOG_PATH, "a") as f:
-            f.write(f"[{timestamp}] {msg}\n")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+        _open_debug_log().write(f"[{timestamp}] {msg}\n")
     except Exception:
         pass  # Don't crash on log failures
 
@@ -50,38 +125,99 @@ def debug_log(msg: str) -> None:
     _write_debug_log(msg)
 
 
-def format_duration(seconds: int) -> str:
-    """Format seconds as human-readable duration."""
-    if seconds < 60:
-        return f"{seconds}s"
-    elif seconds < 3600:
-        mins = seconds // 60
-        secs = seconds % 60
-        return f"{mins}m {secs}s" if secs else f"{mins}m"
-    else:
-        hours = seconds // 3600
-        mins = (seconds % 3600) // 60
-        return f"{hours}h {mins}m" if mins else f"{hours}h"
+def _tail_lines(text: str, n: int) -> str:
+    """Return the last n lines of text, ignoring trailing blank lines.
+
+    Walks backwards with rfind so only the tail is copied, rather than
+    stripping and splitting the whole capture.
+    """
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+    start = end
+    for _ in range(n):
+        start = text.rfind("\n", 0, start)
+        if start < 0:
+            return text[:end]
+    return text[start + 1 : end]
+
+
+def _scan_fallback_indicators(text: str) -> int:
+    """Scan text once and return a bitmask of the fallback indicators present."""
+    flags = 0
+    for match in _FALLBACK_RE.finditer(text):
+        flags |= 1 << ((match.lastindex or 1) - 1)
+    return flags
 
 
 class RateLimitDaemon:
     """Daemon that monitors rate limits and auto-continues sessions."""
 
-    def __init__(self, poll_interval: int = POLL_INTERVAL):
+    def __init__(
+        self,
+        poll_interval: int = POLL_INTERVAL,
+        *,
+        strategy: ContinueStrategy = STRATEGY,
+        status_path: Path | None = None,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r} (expected one of {STRATEGIES})")
         self.poll_interval = poll_interval
+        self.strategy = strategy
+        self._continue_sessions = {
+            "blocked": self._continue_blocked_sessions,
+            "detect": lambda: self._continue_blocked_sessions(use_fallback=False),
+            "all": self._continue_all_sessions,
+        }[strategy]
         self.waiting_for_reset = False
         self.last_status: UsageStatus | None = None
         self.continued_panes: set[str] = set()  # Track panes we've already continued
+        self._idle_backoff = poll_interval
+        self._idle_utilization: tuple[float, float] | None = None
+        self._overdue_backoff: float = MIN_POLL_INTERVAL
+        self._fetch_failed = False
+        self._tmux_ok = False
+        self._tmux_checked_at = float("-inf")
+        self._stop_event = threading.Event()
+        self.status_path = status_path
+        self._status_write_failed = False
+
+    def status(self) -> dict:
+        """Snapshot of the daemon's state, as published to status_path."""
+        return {
+            "pid": os.getpid(),
+            "waiting_for_reset": self.waiting_for_reset,
+            "continued_panes": sorted(self.continued_panes),
+            "poll_interval": self.poll_interval,
+            "updated_at": time.time(),
+        }
+
+    def _write_status(self) -> None:
+        """Publish status() to status_path for processes that can't see this object."""
+        if self.status_path is None:
+            return
+        tmp_path = self.status_path.with_suffix(".tmp")
+        try:
+            self.status_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(self.status()))
+            # Atomic swap so readers never see a half-written file
+            os.replace(tmp_path, self.status_path)
+        except OSError as e:
+            # Loud once, so a read-only location doesn't go unnoticed, then quiet
+            log(f"Could not write status file: {e}", debug_only=self._status_write_failed)
+            self._status_write_failed = True
+        else:
+            self._status_write_failed = False
 
     def run(self) -> None:
         """Main daemon loop."""
         log("cc-wait daemon started")
         log(f"Poll interval: {self.poll_interval}s", debug_only=True)
 
-        if not is_tmux_available():
+        if not self._tmux_available():
             log("Warning: tmux not available. Auto-continue will not work.")
 
-        while True:
+        while not self._stop_event.is_set():
             try:
                 self._check_and_handle()
             except KeyboardInterrupt:
@@ -90,12 +226,85 @@ class RateLimitDaemon:
             except Exception as e:
                 log(f"Error: {e}", debug_only=True)
 
-            time.sleep(self.poll_interval)
+            self._write_status()
+            sleep_for = self._next_sleep()
+            log(f"Next check in {sleep_for:.0f}s", debug_only=True)
+            self._stop_event.wait(sleep_for)
+
+    def stop(self) -> None:
+        """Ask the daemon loop to exit, interrupting any pending sleep."""
+        self._stop_event.set()
+
+    def wait_stopped(self, timeout: float) -> bool:
+        """Block until stop() is called or timeout passes; True if stopped."""
+        return self._stop_event.wait(timeout)
+
+    def _tmux_available(self, *, force: bool = False) -> bool:
+        """Whether tmux is usable, cached for the daemon's lifetime once it is.
+
+        While unavailable, tmux is re-probed at most every TMUX_REPROBE_INTERVAL
+        seconds, or immediately with force (used at reset, where it matters).
+        """
+        now = time.monotonic()
+        if not self._tmux_ok and (force or now - self._tmux_checked_at >= TMUX_REPROBE_INTERVAL):
+            self._tmux_ok = is_tmux_available()
+            self._tmux_checked_at = now
+        return self._tmux_ok
+
+    def _next_sleep(self) -> float:
+        """Seconds to wait before the next poll.
+
+        While limited, poll at the normal interval but wake just after the
+        reset time when it falls inside the interval. Once the reset time has
+        passed, retry from MIN_POLL_INTERVAL, backing off towards the normal
+        interval. After a failed fetch, wait the normal interval.
+
+        While idle, back off exponentially up to MAX_IDLE_INTERVAL as long as
+        utilization holds still; any change, or utilization near the limit,
+        polls normally so a limit hit isn't slept through.
+        """
+        status = self.last_status
+        if self._fetch_failed:
+            # last_status is stale (offline, expired token): don't schedule from it
+            return float(self.poll_interval)
+
+        if status is None or status.is_limited or self.waiting_for_reset:
+            self._idle_backoff = self.poll_interval
+            reset = status.next_reset if status else None
+            until_reset = (reset - datetime.now(UTC)).total_seconds() if reset else None
+            if until_reset is None or until_reset > 0:
+                self._overdue_backoff = MIN_POLL_INTERVAL
+            if until_reset is None:
+                return float(self.poll_interval)
+            if 0 < until_reset < self.poll_interval:
+                return until_reset + 1
+            if until_reset > 0:
+                return float(self.poll_interval)
+            # Reset time passed but the API still shows limited: retry soon,
+            # backing off towards the normal interval
+            sleep_for = self._overdue_backoff
+            self._overdue_backoff = min(
+                self._overdue_backoff * 2, max(self.poll_interval, MIN_POLL_INTERVAL)
+            )
+            return float(sleep_for)
+
+        utilization = (status.five_hour.utilization, status.seven_day.utilization)
+        if utilization != self._idle_utilization or max(utilization) >= HIGH_UTILIZATION:
+            self._idle_utilization = utilization
+            self._idle_backoff = self.poll_interval
+
+        sleep_for = self._idle_backoff
+        if max(utilization) < HIGH_UTILIZATION:
+            self._idle_backoff = min(
+                self._idle_backoff * 2, max(MAX_IDLE_INTERVAL, self.poll_interval)
+            )
+        return float(sleep_for)
 
     def _check_and_handle(self) -> None:
         """Check usage and handle rate limits."""
         status = fetch_usage_status()
 
+        self._fetch_failed = status is None
         if status is None:
             log("Failed to fetch usage status", debug_only=True)
             return
@@ -113,14 +322,14 @@ class RateLimitDaemon:
                     reset_str = reset.strftime("%H:%M")
                     remaining = status.five_hour.resets_in_seconds or 0
                     log(
-                        f"Rate limit hit (100%). Reset at {reset_str} ({format_duration(remaining)})",
+                        f"Rate limit hit (100%). Reset at {reset_str} ({format_duration(remaining, precise=True)})",
                         to_file=True,
                     )
                 else:
                     log("Rate limit hit (100%).", to_file=True)
 
                 # Log Claude sessions that might need continuing
-                panes = get_claude_panes()
+                panes = get_claude_panes() if self._tmux_available() else []
                 debug_log("=" * 60)
                 debug_log("RATE LIMIT HIT - Capturing initial session state")
                 debug_log("=" * 60)
@@ -140,16 +349,35 @@ class RateLimitDaemon:
             if self.waiting_for_reset:
                 # Rate limit just cleared - check which sessions are blocked and continue them
                 log("Rate limit reset! Checking for blocked sessions...", to_file=True)
-                self._continue_blocked_sessions()
+                if self._tmux_available(force=True):
+                    self._continue_sessions()
+                else:
+                    log("tmux not available, cannot continue sessions", to_file=True)
                 self.waiting_for_reset = False
                 self.continued_panes.clear()
 
-    def _continue_blocked_sessions(self) -> None:
+    def _continue_all_sessions(self) -> None:
+        """Send continue sequence to every Claude pane without checking content.
+
+        Relies on send_continue() being harmless for panes that aren't blocked.
+        """
+        panes = [p for p in get_claude_panes() if p.pane_id not in self.continued_panes]
+
+        if not panes:
+            log("No Claude sessions found", to_file=True)
+            return
+
+        log(f"Sending continue to {len(panes)} session(s)...", to_file=True)
+        self._send_continue(panes)
+
+    def _continue_blocked_sessions(self, *, use_fallback: bool = True) -> None:
         """Send continue sequence only to Claude panes that are actually blocked.
 
         Captures each pane's content, checks for rate limit indicators,
         and only sends continue to panes showing the rate limit message.
-        Logs everything for debugging.
+        The last-lines fallback check can be disabled with use_fallback.
+        With CC_WAIT_DEBUG set, each pane's content and detection details
+        are also written to the debug log.
         """
         panes = get_claude_panes()
 
@@ -161,24 +389,37 @@ class RateLimitDaemon:
         debug_log(f"RATE LIMIT RESET - Checking {len(panes)} Claude session(s)")
         debug_log("=" * 60)
 
-        blocked_panes = []
+        todo = []
         for pane in panes:
             if pane.pane_id in self.continued_panes:
                 debug_log(f"[{pane.pane_id}] Already continued, skipping")
-                continue
+            else:
+                todo.append(pane)
 
-            # Capture pane content for analysis
-            content = capture_pane_content(pane.pane_id, lines=50)
+        # Capture all pane contents for analysis in a single tmux invocation
+        contents = capture_panes_bulk([pane.pane_id for pane in todo], lines=CAPTURE_LINES)
 
-            debug_log(f"\n[{pane.pane_id}] Session: {pane.session_name}")
-            debug_log(f"[{pane.pane_id}] Command: {pane.command}")
-            debug_log(f"[{pane.pane_id}] Content length: {len(content)} chars")
-            debug_log(f"[{pane.pane_id}] --- BEGIN CONTENT ---")
-            # Log last 30 lines for context
-            content_lines = content.strip().split("\n")
-            for line in content_lines[-30:]:
-                debug_log(f"[{pane.pane_id}]   {line[:200]}")  # Truncate long lines
-            debug_log(f"[{pane.pane_id}] --- END CONTENT ---")
+        blocked_panes = []
+        for pane in todo:
+            content = contents[pane.pane_id]
+
+            # The per-pane content dump is large, so it is only produced when
+            # debugging detection
+            if DEBUG:
+                pid = pane.pane_id
+                # Last few lines for context, long lines truncated, written as one block
+                tail = "\n".join(
+                    f"[{pid}]   {line[:200]}"
+                    for line in _tail_lines(content, DEBUG_LINES_PER_PANE).split("\n")
+                )
+                debug_log(
+                    f"\n[{pid}] Session: {pane.session_name}\n"
+                    f"[{pid}] Command: {pane.command}\n"
+                    f"[{pid}] Content length: {len(content)} chars\n"
+                    f"[{pid}] --- BEGIN CONTENT ---\n"
+                    f"{tail}\n"
+                    f"[{pid}] --- END CONTENT ---"
+                )
 
             # Check for rate limit indicators
             rate_info = detect_rate_limit(content)
@@ -186,25 +427,28 @@ class RateLimitDaemon:
             if rate_info:
                 debug_log(f"[{pane.pane_id}] DETECTED RATE LIMIT: {rate_info}")
                 blocked_panes.append(pane)
+            elif not use_fallback:
+                debug_log(f"[{pane.pane_id}] NOT BLOCKED - skipping")
             else:
                 # Fallback: check ONLY the last 15 lines for rate limit indicators
                 # This avoids false positives from code/explanations earlier in history
-                last_lines = "\n".join(content_lines[-15:]).lower()
-
-                # Check for either message format:
-                # Format 1: "claude usage limit" + "limit will reset"
-                # Format 2: "you've hit your limit" + "resets"
-                has_format1 = "usage limit" in last_lines and "limit will reset" in last_lines
-                has_format2 = "hit your limit" in last_lines and "resets" in last_lines
-                # Check for the numbered menu that Claude shows
-                has_menu = "1." in last_lines and ("wait" in last_lines or "upgrade" in last_lines)
-
-                debug_log(f"[{pane.pane_id}] Detection results:")
-                debug_log(f"[{pane.pane_id}]   detect_rate_limit(): None")
-                debug_log(f"[{pane.pane_id}]   Checking last 15 lines only...")
-                debug_log(f"[{pane.pane_id}]   format1 (usage limit + will reset): {has_format1}")
-                debug_log(f"[{pane.pane_id}]   format2 (hit your limit + resets): {has_format2}")
-                debug_log(f"[{pane.pane_id}]   menu format (1. + wait/upgrade): {has_menu}")
+                flags = _scan_fallback_indicators(_tail_lines(content, 15).lower())
+
+                # Either message format, plus the numbered menu that Claude shows
+                has_format1 = flags & _FORMAT1 == _FORMAT1
+                has_format2 = flags & _FORMAT2 == _FORMAT2
+                has_menu = bool(flags & _MENU_ITEM) and bool(flags & (_WAIT | _UPGRADE))
+
+                if DEBUG:
+                    pid = pane.pane_id
+                    debug_log(
+                        f"[{pid}] Detection results:\n"
+                        f"[{pid}]   detect_rate_limit(): None\n"
+                        f"[{pid}]   Checking last 15 lines only...\n"
+                        f"[{pid}]   format1 (usage limit + will reset): {has_format1}\n"
+                        f"[{pid}]   format2 (hit your limit + resets): {has_format2}\n"
+                        f"[{pid}]   menu format (1. + wait/upgrade): {has_menu}"
+                    )
 
                 # Require rate limit text AND the menu format
                 if (has_format1 or has_format2) and has_menu:
@@ -222,9 +466,13 @@ class RateLimitDaemon:
             return
 
         log(f"Sending continue to {len(blocked_panes)} blocked session(s)...", to_file=True)
+        self._send_continue(blocked_panes)
 
-        for pane in blocked_panes:
-            if send_continue(pane.pane_id):
+    def _send_continue(self, panes: list[TmuxPane]) -> None:
+        """Send the continue sequence to all panes at once and remember the ones that took it."""
+        results = send_continue_many([pane.pane_id for pane in panes])
+        for pane, sent in zip(panes, results, strict=True):
+            if sent:
                 log(
                     f"  → {pane.pane_id} ({pane.session_name}): sent '1' + 'continue'", to_file=True
                 )
@@ -233,7 +481,31 @@ class RateLimitDaemon:
                 log(f"  ✗ {pane.pane_id} ({pane.session_name}): failed to send", to_file=True)
 
 
-def run_daemon(poll_interval: int = POLL_INTERVAL) -> None:
-    """Run the rate limit daemon."""
-    daemon = RateLimitDaemon(poll_interval=poll_interval)
+def _stop_when_orphaned(daemon: RateLimitDaemon, parent_pid: int) -> None:
+    """Stop the daemon once the process that started it has gone away."""
+    while not daemon.wait_stopped(5):
+        if os.getppid() != parent_pid:
+            log("Parent process exited, stopping daemon")
+            daemon.stop()
+
+
+def run_daemon(
+    poll_interval: int = POLL_INTERVAL,
+    strategy: ContinueStrategy = STRATEGY,
+    *,
+    status_path: Path | None = None,
+    parent_pid: int | None = None,
+) -> None:
+    """
+    Run the rate limit daemon.
+
+    status_path, if given, receives a JSON status snapshot after every check.
+    parent_pid is set when running as a child process (see cc_wait.server) so
+    the daemon exits with its parent instead of lingering as an orphan.
+    """
+    daemon = RateLimitDaemon(
+        poll_interval=poll_interval, strategy=strategy, status_path=status_path
+    )
+    if parent_pid is not None:
+        threading.Thread(target=_stop_when_orphaned, args=(daemon, parent_pid), daemon=True).start()
     daemon.run()
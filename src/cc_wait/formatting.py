@@ -0,0 +1,28 @@
+"""Human-readable formatting shared by the CLI, daemon, and dashboard."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def format_duration(seconds: int | None, *, precise: bool = False) -> str:
+    """
+    Format seconds as human-readable duration.
+
+    Durations under an hour drop their seconds unless precise is set
+    ("5m" vs "5m 30s"). Results are cached since the same values recur
+    across polls and status rows.
+    """
+    if seconds is None:
+        return "N/A"
+    if seconds < 60:
+        return f"{seconds}s"
+    elif seconds < 3600:
+        mins = seconds // 60
+        secs = seconds % 60
+        return f"{mins}m {secs}s" if precise and secs else f"{mins}m"
+    else:
+        hours = seconds // 3600
+        mins = (seconds % 3600) // 60
+        return f"{hours}h {mins}m" if mins else f"{hours}h"
@@ -2,25 +2,36 @@
 
 from __future__ import annotations
 
+import atexit
 import json
+import threading
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import httpx
+if TYPE_CHECKING:
+    import httpx
 
 CREDENTIALS_PATH = Path.home() / ".claude" / ".credentials.json"
 USAGE_API_URL = "https://api.anthropic.com/api/oauth/usage"
 
+# Shared client so repeated polls reuse the pooled TLS connection
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
 
-@dataclass
+
+@dataclass(frozen=True)
 class UsageWindow:
     """Rate limit usage for a time window."""
 
     utilization: float  # 0-100 percentage
     resets_at: datetime | None
 
-    @property
+    # Frozen, so derived flags can be computed once and stored. resets_in_seconds
+    # depends on the clock and stays a plain property.
+    @cached_property
     def is_limited(self) -> bool:
         """True if utilization is at or above 100%."""
         return self.utilization >= 100.0
@@ -28,13 +39,18 @@ class UsageWindow:
     @property
     def resets_in_seconds(self) -> int | None:
         """Seconds until reset, or None if no reset time."""
+        return self.seconds_until_reset()
+
+    def seconds_until_reset(self, now: datetime | None = None) -> int | None:
+        """Seconds from ``now`` (default: current time) until reset, or None."""
         if self.resets_at is None:
             return None
-        delta = self.resets_at - datetime.now(UTC)
-        return max(0, int(delta.total_seconds()))
+        if now is None:
+            now = datetime.now(UTC)
+        return max(0, int((self.resets_at - now).total_seconds()))
 
 
-@dataclass
+@dataclass(frozen=True)
 class UsageStatus:
     """Current rate limit status from OAuth API."""
 
@@ -42,20 +58,19 @@ class UsageStatus:
     seven_day: UsageWindow
     seven_day_opus: UsageWindow | None = None
 
-    @property
+    @cached_property
     def is_limited(self) -> bool:
         """True if any window is at limit."""
         return self.five_hour.is_limited or self.seven_day.is_limited
 
-    @property
+    @cached_property
     def next_reset(self) -> datetime | None:
         """Earliest reset time across all limited windows."""
-        resets = []
-        if self.five_hour.is_limited and self.five_hour.resets_at:
-            resets.append(self.five_hour.resets_at)
-        if self.seven_day.is_limited and self.seven_day.resets_at:
-            resets.append(self.seven_day.resets_at)
-        return min(resets) if resets else None
+        five_hour = self.five_hour.resets_at if self.five_hour.is_limited else None
+        seven_day = self.seven_day.resets_at if self.seven_day.is_limited else None
+        if five_hour and seven_day:
+            return min(five_hour, seven_day)
+        return five_hour or seven_day
 
 
 def load_oauth_token() -> str | None:
@@ -78,8 +93,7 @@ def _parse_datetime(s: str | None) -> datetime | None:
     if not s:
         return None
     try:
-        # Handle various ISO formats
-        s = s.replace("Z", "+00:00")
+        # fromisoformat accepts a trailing "Z" natively since Python 3.11
         return datetime.fromisoformat(s)
     except ValueError:
         return None
@@ -93,6 +107,30 @@ def _parse_window(data: dict) -> UsageWindow:
     )
 
 
+def _get_client() -> httpx.Client:
+    """Return the shared usage API client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            # Imported lazily: httpx is slow to import and only needed once we poll
+            import httpx
+
+            _client = httpx.Client(
+                headers={"anthropic-beta": "oauth-2025-04-20"},
+                timeout=10.0,
+            )
+        return _client
+
+
+@atexit.register
+def _close_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
 def fetch_usage_status(token: str | None = None) -> UsageStatus | None:
     """
     Fetch current usage status from OAuth API.
@@ -104,14 +142,12 @@ def fetch_usage_status(token: str | None = None) -> UsageStatus | None:
     if token is None:
         return None
 
+    import httpx
+
     try:
-        response = httpx.get(
+        response = _get_client().get(
             USAGE_API_URL,
-            headers={
-                "Authorization": f"Bearer {token}",
-                "anthropic-beta": "oauth-2025-04-20",
-            },
-            timeout=10.0,
+            headers={"Authorization": f"Bearer {token}"},
         )
         response.raise_for_status()
         data = response.json()
@@ -3,14 +3,24 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import html
+import json
+import multiprocessing
 import os
 import sys
-import threading
-from datetime import datetime
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, TextIO
 
 import uvicorn
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fasthtml.common import (
     H1,
     H2,
@@ -20,6 +30,7 @@ from fasthtml.common import (
     Head,
     Html,
     Meta,
+    NotStr,
     P,
     Script,
     Span,
@@ -29,16 +40,61 @@ from fasthtml.common import (
 )
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
-from cc_wait.daemon import RateLimitDaemon
+from cc_wait.daemon import run_daemon
+from cc_wait.formatting import format_duration
 from cc_wait.oauth import UsageStatus, UsageWindow, fetch_usage_status
-from cc_wait.tmux import TmuxPane, find_rate_limited_panes, get_claude_panes
-from cc_wait.tracing import create_span, setup_tracing
+from cc_wait.tmux import TmuxPane, scan_claude_panes_async
+from cc_wait.tracing import OTEL_ENABLED, create_span, setup_tracing
 
-# Initialize tracing
-setup_tracing()
 
-# Global daemon instance for status access
-_daemon: RateLimitDaemon | None = None
+def _runtime_dir() -> Path:
+    """Per-user directory for the daemon's lock and status files.
+
+    Not ~/.claude, which is mounted read-only in the Docker deployment.
+    """
+    xdg_runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if xdg_runtime:
+        return Path(xdg_runtime) / "cc-wait"
+    # The temp dir is shared between users, so keep each user's files apart
+    name = f"cc-wait-{os.getuid()}" if hasattr(os, "getuid") else "cc-wait"
+    return Path(tempfile.gettempdir()) / name
+
+
+RUNTIME_DIR = _runtime_dir()
+
+# Held by whichever worker process runs the daemon, so only one of them does
+DAEMON_LOCK_PATH = RUNTIME_DIR / "daemon.lock"
+_daemon_lock_fp: TextIO | None = None
+
+# The daemon runs in its own process and publishes its state here for every worker
+DAEMON_STATUS_PATH = Path(os.environ.get("CC_WAIT_STATUS_PATH", RUNTIME_DIR / "status.json"))
+
+# Short-lived response cache: pages auto-refresh and several clients may poll
+# at once, but tmux and usage data change slowly
+RESPONSE_CACHE_TTL = 5.0
+_response_cache: dict[str, tuple[float, Any]] = {}
+_response_locks: dict[str, asyncio.Lock] = {}
+_cached_waiting_for_reset = False
+
+# How often request handling re-reads the daemon status file to notice a
+# waiting_for_reset flip; a cache hit shouldn't cost a file read and a kill()
+DAEMON_STATUS_CHECK_INTERVAL = 1.0
+_daemon_status_checked_at = float("-inf")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Set up tracing and start the daemon process with the server; stop it on shutdown."""
+    # Done here rather than at import, so importing the module (tests, --help)
+    # doesn't build the OTLP exporter and its background thread
+    setup_tracing()
+    process = _start_daemon_process()
+    yield
+    if process is not None:
+        process.terminate()
+        process.join(timeout=5)
+        DAEMON_STATUS_PATH.unlink(missing_ok=True)
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -46,10 +102,14 @@ app = FastAPI(
     description="Claude Code session monitoring dashboard",
     version="0.2.0",
     root_path=os.environ.get("ROOT_PATH", ""),
+    lifespan=lifespan,
 )
 
-# Instrument FastAPI with OpenTelemetry
-FastAPIInstrumentor.instrument_app(app)
+# Instrument FastAPI with OpenTelemetry (per-request spans are pointless when disabled).
+# This has to happen before startup, since it adds middleware; it only resolves the
+# tracer provider that lifespan sets up once requests arrive.
+if OTEL_ENABLED:
+    FastAPIInstrumentor.instrument_app(app)
 
 # CSS styles
 STYLES = """
@@ -286,19 +346,30 @@ setInterval(updateTimes, 60000);
 """
 
 
-def format_duration(seconds: int | None) -> str:
-    """Format seconds as human-readable duration."""
-    if seconds is None:
-        return "N/A"
-    if seconds < 60:
-        return f"{seconds}s"
-    elif seconds < 3600:
-        mins = seconds // 60
-        return f"{mins}m"
-    else:
-        hours = seconds // 3600
-        mins = (seconds % 3600) // 60
-        return f"{hours}h {mins}m" if mins else f"{hours}h"
+# Placeholder swapped for the dashboard body when splitting the page shell
+_CONTENT_MARKER = "__cc_wait_content__"
+
+
+def _build_page_shell() -> tuple[str, str]:
+    """Render the static page around the container once, split at its contents."""
+    doctype, page = Html(
+        Head(
+            Meta(charset="utf-8"),
+            Meta(name="viewport", content="width=device-width, initial-scale=1"),
+            Title("cc-wait Dashboard"),
+            Style(STYLES),
+        ),
+        Body(
+            Div(_CONTENT_MARKER, cls="container"),
+            Script(REFRESH_SCRIPT),
+        ),
+    )
+    prefix, suffix = (str(doctype) + to_xml(page)).split(_CONTENT_MARKER)
+    return prefix, suffix
+
+
+# Head, styles and script never change, so only the container body is rendered per request
+_PAGE_PREFIX, _PAGE_SUFFIX = _build_page_shell()
 
 
 def get_status_class(utilization: float) -> str:
@@ -310,10 +381,10 @@ def get_status_class(utilization: float) -> str:
     return "ok"
 
 
-def render_usage_card(title: str, window: UsageWindow):
+def render_usage_card(title: str, window: UsageWindow, now: datetime | None = None):
     """Render a usage card for a time window."""
     status_class = get_status_class(window.utilization)
-    resets_in = format_duration(window.resets_in_seconds)
+    resets_in = format_duration(window.seconds_until_reset(now))
 
     return Div(
         H2(title),
@@ -330,49 +401,52 @@ def render_usage_card(title: str, window: UsageWindow):
     )
 
 
-def render_session_tile(pane: TmuxPane):
-    """Render a session tile."""
-    status_class = "limited" if pane.is_rate_limited else "ok"
-    status_text = "Rate Limited" if pane.is_rate_limited else "Active"
-    tile_class = "session-tile rate-limited" if pane.is_rate_limited else "session-tile"
+def _tile_template(tile_class: str, status_class: str, status_text: str) -> str:
+    """Session tile markup for one status, with placeholders for the pane fields."""
+    return (
+        f'<div class="{tile_class}"><div class="session-header">'
+        '<span class="session-id">{pane_id}</span>'
+        f'<span class="session-status {status_class}">'
+        f'<span class="status-dot"></span>{status_text}</span></div>'
+        '<div class="session-name">{session_name}</div>'
+        '<div class="session-command">{command}</div></div>'
+    )
 
-    return Div(
-        Div(
-            Span(pane.pane_id, cls="session-id"),
-            Span(
-                Span(cls="status-dot"),
-                status_text,
-                cls=f"session-status {status_class}",
-            ),
-            cls="session-header",
-        ),
-        Div(pane.session_name, cls="session-name"),
-        Div(pane.command, cls="session-command"),
-        cls=tile_class,
+
+# Tiles only differ by status and three pane fields, so skip building FastHTML trees
+_TILE_OK = _tile_template("session-tile", "ok", "Active")
+_TILE_LIMITED = _tile_template("session-tile rate-limited", "limited", "Rate Limited")
+
+
+def render_session_tile(pane: TmuxPane) -> str:
+    """Render a session tile as HTML."""
+    template = _TILE_LIMITED if pane.is_rate_limited else _TILE_OK
+    # Session names and commands come from tmux, so escape them
+    return template.format(
+        pane_id=html.escape(pane.pane_id),
+        session_name=html.escape(pane.session_name),
+        command=html.escape(pane.command),
     )
 
 
 def render_dashboard(
     usage: UsageStatus | None,
     panes: list[TmuxPane],
-    limited_panes: list[TmuxPane],
-):
-    """Render the full dashboard."""
-    now = datetime.now().strftime("%H:%M:%S")
-
-    # Mark rate-limited panes
-    limited_ids = {p.pane_id for p in limited_panes}
-    for pane in panes:
-        pane.is_rate_limited = pane.pane_id in limited_ids
+) -> str:
+    """Render the full dashboard page."""
+    # One clock read for the header and every reset countdown
+    now = datetime.now(UTC)
 
-    # Sort: limited first, then by session name
-    panes.sort(key=lambda p: (not p.is_rate_limited, p.session_name))
+    # Sort: limited first, then by session name. Two stable sorts on C-level
+    # keys avoid building a tuple per pane
+    panes.sort(key=attrgetter("session_name"))
+    panes.sort(key=attrgetter("is_rate_limited"), reverse=True)
 
     # Build content
     content = [
         Div(
             H1("Claude Code Sessions"),
-            Span(f"Last updated: {now}", cls="last-updated"),
+            Span(f"Last updated: {now.astimezone():%H:%M:%S}", cls="last-updated"),
             cls="header",
         ),
     ]
@@ -381,8 +455,8 @@ def render_dashboard(
     if usage:
         content.append(
             Div(
-                render_usage_card("5-Hour Usage", usage.five_hour),
-                render_usage_card("Weekly Usage", usage.seven_day),
+                render_usage_card("5-Hour Usage", usage.five_hour, now),
+                render_usage_card("Weekly Usage", usage.seven_day, now),
                 cls="usage-section",
             )
         )
@@ -402,8 +476,8 @@ def render_dashboard(
     content.append(Div(session_header, cls="sessions-section"))
 
     if panes:
-        tiles = [render_session_tile(pane) for pane in panes]
-        content.append(Div(*tiles, cls="sessions-grid"))
+        tiles = "".join(render_session_tile(pane) for pane in panes)
+        content.append(Div(NotStr(tiles), cls="sessions-grid"))
     else:
         content.append(
             Div(
@@ -413,122 +487,270 @@ def render_dashboard(
             )
         )
 
-    return Html(
-        Head(
-            Meta(charset="utf-8"),
-            Meta(name="viewport", content="width=device-width, initial-scale=1"),
-            Title("cc-wait Dashboard"),
-            Style(STYLES),
-        ),
-        Body(
-            Div(*content, cls="container"),
-            Script(REFRESH_SCRIPT),
-        ),
-    )
+    return _PAGE_PREFIX + "".join(to_xml(part) for part in content) + _PAGE_SUFFIX
+
+
+def invalidate_response_cache() -> None:
+    """Drop all cached responses so the next request recomputes them."""
+    _response_cache.clear()
+
+
+def _get_cached_response(key: str) -> Any | None:
+    """
+    Return the cached value for key if it is still fresh, else None.
+
+    The cache is dropped when the daemon starts or stops waiting for a reset,
+    so the page reflects that transition immediately.
+    """
+    global _cached_waiting_for_reset, _daemon_status_checked_at
+    now = time.monotonic()
+    if now - _daemon_status_checked_at >= DAEMON_STATUS_CHECK_INTERVAL:
+        _daemon_status_checked_at = now
+        daemon_status = _read_daemon_status()
+        waiting = bool(daemon_status and daemon_status["waiting_for_reset"])
+        if waiting != _cached_waiting_for_reset:
+            _cached_waiting_for_reset = waiting
+            invalidate_response_cache()
+
+    entry = _response_cache.get(key)
+    if entry is not None and now - entry[0] < RESPONSE_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+async def _cached_response(key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached value for key, recomputing it at most once per TTL.
+
+    Concurrent misses for the same key wait on one computation instead of
+    each re-running the tmux and usage API calls.
+    """
+    value = _get_cached_response(key)
+    if value is not None:
+        return value
+
+    lock = _response_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another request may have filled the cache while we waited
+        value = _get_cached_response(key)
+        if value is None:
+            value = await compute()
+            _response_cache[key] = (time.monotonic(), value)
+        return value
+
+
+async def _fetch_usage() -> UsageStatus | None:
+    """Fetch usage in a worker thread so the blocking HTTP call doesn't stall the loop."""
+    with create_span("fetch_usage"):
+        return await asyncio.to_thread(fetch_usage_status)
+
+
+async def _get_sessions() -> list[TmuxPane]:
+    """List Claude panes, marked with their rate limit status."""
+    with create_span("get_sessions"):
+        return await scan_claude_panes_async()
+
+
+async def _build_dashboard_html() -> str:
+    """Fetch usage and sessions concurrently and render the dashboard page."""
+    usage, panes = await asyncio.gather(_fetch_usage(), _get_sessions())
+
+    return render_dashboard(usage, panes)
+
+
+async def _stream_dashboard() -> AsyncIterator[str]:
+    """Send the static head right away, then the body once the data is in."""
+    yield _PAGE_PREFIX
+    try:
+        with create_span("render_dashboard"):
+            page = await _cached_response("dashboard", _build_dashboard_html)
+    except Exception as e:
+        # The head is already sent, so the status can't change; close the document instead
+        print(f"Error rendering dashboard: {e!r}", file=sys.stderr)
+        error = Div(f"Unable to render the dashboard: {e}", cls="error-banner")
+        yield to_xml(error) + _PAGE_SUFFIX
+        return
+    yield page[len(_PAGE_PREFIX) :]
 
 
 @app.get("/", response_class=HTMLResponse)
 async def dashboard():
     """Render the dashboard."""
-    with create_span("render_dashboard"):
-        with create_span("fetch_usage"):
-            usage = fetch_usage_status()
+    page = _get_cached_response("dashboard")
+    if page is not None:
+        return HTMLResponse(page)
+    # On a miss, let the browser start on the stylesheet while tmux is scanned
+    return StreamingResponse(_stream_dashboard(), media_type="text/html")
 
-        with create_span("get_sessions"):
-            panes = get_claude_panes()
-            limited_panes = find_rate_limited_panes()
 
-        html = render_dashboard(usage, panes, limited_panes)
-        # Html() returns (doctype, content) tuple - render properly
-        doctype, content = html
-        return HTMLResponse(str(doctype) + to_xml(content))
+def _encode_json(data: dict) -> bytes:
+    """Serialize an API payload once, so cache hits skip FastAPI's encoder entirely."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
 
 
-@app.get("/api/usage")
-async def api_usage():
-    """Get current usage status as JSON."""
-    with create_span("api_usage"):
-        usage = fetch_usage_status()
-        if usage is None:
-            return {"error": "Could not fetch usage"}
+def _json_response(body: bytes) -> Response:
+    """Wrap pre-serialized JSON in a response."""
+    return Response(body, media_type="application/json")
+
 
-        return {
+async def _build_usage_json() -> bytes:
+    """Fetch usage and serialize it for the JSON API."""
+    usage = await _fetch_usage()
+    if usage is None:
+        return _encode_json({"error": "Could not fetch usage"})
+
+    now = datetime.now(UTC)
+    return _encode_json(
+        {
             "five_hour": {
                 "utilization": usage.five_hour.utilization,
                 "is_limited": usage.five_hour.is_limited,
-                "resets_in_seconds": usage.five_hour.resets_in_seconds,
+                "resets_in_seconds": usage.five_hour.seconds_until_reset(now),
             },
             "seven_day": {
                 "utilization": usage.seven_day.utilization,
                 "is_limited": usage.seven_day.is_limited,
-                "resets_in_seconds": usage.seven_day.resets_in_seconds,
+                "resets_in_seconds": usage.seven_day.seconds_until_reset(now),
             },
             "is_limited": usage.is_limited,
         }
+    )
 
 
-@app.get("/api/sessions")
-async def api_sessions():
-    """Get current Claude sessions as JSON."""
-    with create_span("api_sessions"):
-        panes = get_claude_panes()
-        limited_panes = find_rate_limited_panes()
-        limited_ids = {p.pane_id for p in limited_panes}
+@app.get("/api/usage")
+async def api_usage():
+    """Get current usage status as JSON."""
+    with create_span("api_usage"):
+        return _json_response(await _cached_response("usage", _build_usage_json))
+
+
+async def _build_sessions_json() -> bytes:
+    """List Claude sessions and serialize them for the JSON API."""
+    panes = await _get_sessions()
 
-        return {
+    return _encode_json(
+        {
             "total": len(panes),
-            "rate_limited": len(limited_panes),
+            "rate_limited": sum(p.is_rate_limited for p in panes),
             "sessions": [
                 {
                     "pane_id": p.pane_id,
                     "session_name": p.session_name,
                     "command": p.command,
-                    "is_rate_limited": p.pane_id in limited_ids,
+                    "is_rate_limited": p.is_rate_limited,
                 }
                 for p in panes
             ],
         }
+    )
+
+
+@app.get("/api/sessions")
+async def api_sessions():
+    """Get current Claude sessions as JSON."""
+    with create_span("api_sessions"):
+        return _json_response(await _cached_response("sessions", _build_sessions_json))
+
+
+def _read_daemon_status() -> dict | None:
+    """Read the daemon's published status, or None if no daemon is running."""
+    try:
+        status = json.loads(DAEMON_STATUS_PATH.read_text())
+        os.kill(status["pid"], 0)
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing/corrupt file, or left behind by a daemon that has died
+        return None
+    return status
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    global _daemon
+    status = _read_daemon_status()
     return {
         "status": "healthy",
-        "daemon_running": _daemon is not None,
-        "waiting_for_reset": _daemon.waiting_for_reset if _daemon else False,
+        "daemon_running": status is not None,
+        "waiting_for_reset": status["waiting_for_reset"] if status else False,
     }
 
 
 @app.get("/api/daemon")
 async def api_daemon():
     """Get daemon status."""
-    global _daemon
-    if _daemon is None:
+    status = _read_daemon_status()
+    if status is None:
         return {"error": "Daemon not running"}
 
     return {
         "running": True,
-        "waiting_for_reset": _daemon.waiting_for_reset,
-        "continued_panes": list(_daemon.continued_panes),
-        "poll_interval": _daemon.poll_interval,
+        "waiting_for_reset": status["waiting_for_reset"],
+        "continued_panes": status["continued_panes"],
+        "poll_interval": status["poll_interval"],
     }
 
 
-def _run_daemon_thread():
-    """Run the daemon in a background thread."""
-    global _daemon
-    _daemon = RateLimitDaemon()
-    _daemon.run()
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Start the daemon in a background thread on server startup."""
-    daemon_thread = threading.Thread(target=_run_daemon_thread, daemon=True)
-    daemon_thread.start()
-    print("Daemon monitoring thread started")
+def _worker_count() -> int:
+    """Number of server worker processes, as set by main() or WEB_CONCURRENCY."""
+    try:
+        return int(os.environ.get("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+def _acquire_daemon_lock() -> bool:
+    """
+    Try to become the one process that runs the daemon.
+
+    With several uvicorn workers each one runs the lifespan; an exclusive
+    flock on DAEMON_LOCK_PATH (released when the process exits) makes sure
+    only the first starts a daemon instead of N of them driving tmux.
+    """
+    global _daemon_lock_fp
+    try:
+        import fcntl
+    except ImportError:
+        return True  # No flock (Windows): single worker only
+
+    try:
+        DAEMON_LOCK_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Kept open for the life of the process; closing it would release the lock
+        fp = open(DAEMON_LOCK_PATH, "a")
+    except OSError as e:
+        if _worker_count() > 1:
+            # Without the lock every worker would drive tmux, so none does
+            print(
+                f"ERROR: cannot open daemon lock {DAEMON_LOCK_PATH} ({e}); "
+                "auto-continue is DISABLED for this worker",
+                file=sys.stderr,
+            )
+            return False
+        # A single worker can't race anyone, so run the daemon anyway
+        print(f"Warning: cannot open daemon lock {DAEMON_LOCK_PATH} ({e})", file=sys.stderr)
+        return True
+    try:
+        fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fp.close()
+        return False
+    _daemon_lock_fp = fp
+    return True
+
+
+def _start_daemon_process() -> multiprocessing.process.BaseProcess | None:
+    """Start the daemon in a child process, unless another worker already has."""
+    if not _acquire_daemon_lock():
+        print("Daemon already running in another worker")
+        return None
+    # spawn rather than fork: the parent is mid event loop with threads running
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_daemon,
+        kwargs={"status_path": DAEMON_STATUS_PATH, "parent_pid": os.getpid()},
+        name="cc-wait-daemon",
+        daemon=True,
+    )
+    process.start()
+    print(f"Daemon monitoring process started (pid {process.pid})")
+    return process
 
 
 def main():
@@ -546,10 +768,30 @@ def main():
         default=os.environ.get("HOST", "0.0.0.0"),
         help="Host to bind to (default: 0.0.0.0)",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=_worker_count(),
+        help="Worker processes; the daemon runs in only one of them (default: 1)",
+    )
     args = parser.parse_args()
 
+    # Workers are separate processes; this tells them how many there are
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+
     print(f"Starting cc-wait dashboard + daemon on http://{args.host}:{args.port}")
-    uvicorn.run(app, host=args.host, port=args.port)
+    # uvloop and httptools come with uvicorn[standard]; "auto" uses them and falls
+    # back to asyncio/h11 where they aren't available (e.g. Windows)
+    uvicorn.run(
+        # Multiple workers need an import string so each process can load the app
+        "cc_wait.server:app" if args.workers > 1 else app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="auto",
+        http="auto",
+    )
 
 
 if __name__ == "__main__":
@@ -2,22 +2,41 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import re
 import subprocess
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, replace
 
+# Marker line printed before each pane's content in capture_panes_bulk()
+_CAPTURE_SENTINEL = "__cc_wait_capture__ "
 
-def _get_tmux_env() -> dict[str, str]:
-    """Get environment variables for tmux commands."""
-    env = os.environ.copy()
-    # Allow overriding tmux socket directory (useful for Docker)
-    if "TMUX_TMPDIR" in os.environ:
-        env["TMUX_TMPDIR"] = os.environ["TMUX_TMPDIR"]
-    return env
 
+# Environment passed to every tmux subprocess, built on first use
+_tmux_env: dict[str, str] | None = None
 
-@dataclass
+
+def _get_tmux_env(*, refresh: bool = False) -> dict[str, str]:
+    """
+    Get environment variables for tmux commands.
+
+    The copy of os.environ is made once and shared by every tmux call
+    (callers must not mutate it); pass refresh=True to rebuild it after
+    changing the environment.
+    """
+    global _tmux_env
+    if _tmux_env is None or refresh:
+        env = os.environ.copy()
+        # Allow overriding tmux socket directory (useful for Docker)
+        if "TMUX_TMPDIR" in os.environ:
+            env["TMUX_TMPDIR"] = os.environ["TMUX_TMPDIR"]
+        _tmux_env = env
+    return _tmux_env
+
+
+@dataclass(slots=True)
 class TmuxPane:
     """A tmux pane running Claude."""
 
@@ -42,17 +61,72 @@ def is_tmux_available() -> bool:
         return False
 
 
+# list-panes arguments shared by the sync and async pane listings
+_LIST_PANES_ARGS = (
+    "list-panes",
+    "-a",
+    "-F",
+    "#{pane_id}\t#{session_name}\t#{pane_current_command}",
+)
+
+
+def _parse_claude_panes(output: str) -> list[TmuxPane]:
+    """Parse list-panes output into the panes running Claude."""
+    panes = []
+    for line in output.strip().split("\n"):
+        if not line:
+            continue
+        parts = line.split("\t")
+        if len(parts) >= 3:
+            pane_id, session_name, command = parts[0], parts[1], parts[2]
+            if "claude" in command.lower():
+                panes.append(
+                    TmuxPane(
+                        pane_id=pane_id,
+                        session_name=session_name,
+                        command=command,
+                    )
+                )
+    return panes
+
+
+# Pane listings are reused briefly so the separate scans behind one dashboard
+# render (or back-to-back API calls) share a single `tmux list-panes`
+PANES_CACHE_TTL = 1.0
+_panes_cache: tuple[float, list[TmuxPane]] | None = None
+_panes_cache_lock = threading.Lock()
+
+
+def _get_cached_panes() -> list[TmuxPane] | None:
+    """Return copies of the cached pane listing if still fresh."""
+    with _panes_cache_lock:
+        if _panes_cache is None or time.monotonic() - _panes_cache[0] >= PANES_CACHE_TTL:
+            return None
+        # Copies, since callers set is_rate_limited/reset_info on their panes
+        return [replace(pane) for pane in _panes_cache[1]]
+
+
+def _set_cached_panes(panes: list[TmuxPane]) -> None:
+    global _panes_cache
+    with _panes_cache_lock:
+        _panes_cache = (time.monotonic(), [replace(pane) for pane in panes])
+
+
 def get_claude_panes() -> list[TmuxPane]:
     """Find all tmux panes running Claude."""
+    cached = _get_cached_panes()
+    if cached is not None:
+        return cached
+    panes = _list_claude_panes()
+    _set_cached_panes(panes)
+    return panes
+
+
+def _list_claude_panes() -> list[TmuxPane]:
+    """Run `tmux list-panes` and return the panes running Claude."""
     try:
         result = subprocess.run(
-            [
-                "tmux",
-                "list-panes",
-                "-a",
-                "-F",
-                "#{pane_id}\t#{session_name}\t#{pane_current_command}",
-            ],
+            ["tmux", *_LIST_PANES_ARGS],
             capture_output=True,
             text=True,
             timeout=5,
@@ -60,23 +134,7 @@ def get_claude_panes() -> list[TmuxPane]:
         )
         if result.returncode != 0:
             return []
-
-        panes = []
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
-            parts = line.split("\t")
-            if len(parts) >= 3:
-                pane_id, session_name, command = parts[0], parts[1], parts[2]
-                if "claude" in command.lower():
-                    panes.append(
-                        TmuxPane(
-                            pane_id=pane_id,
-                            session_name=session_name,
-                            command=command,
-                        )
-                    )
-        return panes
+        return _parse_claude_panes(result.stdout)
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return []
 
@@ -96,6 +154,89 @@ def capture_pane_content(pane_id: str, lines: int = 100) -> str:
         return ""
 
 
+def capture_panes_bulk(pane_ids: list[str], lines: int = 100) -> dict[str, str]:
+    """
+    Capture several panes with a single tmux invocation.
+
+    Chains a sentinel `display-message` and a `capture-pane` per pane into one
+    command, so N panes cost one subprocess and one round trip to the tmux
+    server. tmux aborts the chain at the first pane that has gone away, so any
+    pane missing from the output is captured individually.
+
+    Returns a dict mapping every requested pane ID to its content ("" on failure).
+    """
+    if not pane_ids:
+        return {}
+
+    try:
+        result = subprocess.run(
+            ["tmux", *_bulk_capture_args(pane_ids, lines)],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            env=_get_tmux_env(),
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return dict.fromkeys(pane_ids, "")
+
+    captured = _split_bulk_capture(result.stdout)
+    return {
+        pane_id: captured[pane_id] if pane_id in captured else capture_pane_content(pane_id, lines)
+        for pane_id in pane_ids
+    }
+
+
+def _bulk_capture_args(pane_ids: list[str], lines: int) -> list[str]:
+    """Build the chained tmux arguments for capture_panes_bulk()."""
+    args: list[str] = []
+    for pane_id in pane_ids:
+        if args:
+            args.append(";")
+        args += ["display-message", "-p", "-t", pane_id, _CAPTURE_SENTINEL + "#{pane_id}", ";"]
+        args += ["capture-pane", "-p", "-t", pane_id, "-S", f"-{lines}"]
+    return args
+
+
+def _split_bulk_capture(output: str) -> dict[str, str]:
+    """Split chained capture output into per-pane content at the sentinel lines."""
+    captured: dict[str, list[str]] = {}
+    current: list[str] | None = None
+    for line in output.splitlines(keepends=True):
+        if line.startswith(_CAPTURE_SENTINEL):
+            current = captured.setdefault(line[len(_CAPTURE_SENTINEL) :].rstrip("\n"), [])
+        elif current is not None:
+            current.append(line)
+    return {pane_id: "".join(chunks) for pane_id, chunks in captured.items()}
+
+
+# Both message formats in one pattern so the pane is scanned once; they share
+# the time/timezone tail, so the groups are the same whichever one matched.
+# Matched against the lowercased pane: without IGNORECASE the alternation is
+# about twice as fast as two case-insensitive patterns.
+_RATE_LIMIT_RE = re.compile(
+    r"(?:claude\s+usage\s+limit\s+reached.*?limit\s+will\s+reset\s+at"
+    r"|you've\s+hit\s+your\s+limit\s*[·\-]\s*resets)"
+    r"\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)\s*(?:\(([^)]+)\))?",
+    re.DOTALL,
+)
+
+# Only the end of a capture is searched: a limited session stops producing
+# output, so its banner and menu sit at the bottom of the pane
+RATE_LIMIT_TAIL_CHARS = 4096
+
+# Recent detection results keyed by pane tail: a pane that hasn't changed since
+# the last poll is answered without re-running the patterns
+DETECT_CACHE_SIZE = 64
+_detect_cache: dict[str, dict | None] = {}
+_detect_cache_lock = threading.Lock()
+
+# Casings of "limit" checked before lowercasing, so most panes are never copied
+_LIMIT_CASINGS = ("limit", "Limit", "LIMIT")
+
+# Code/diff indicators near a match: quotes, assignment, REPL prompts, diff markers
+_CODE_INDICATOR_RE = re.compile(r'content ?= ?"|= "(?:claude|you)|>>> |\.\.\. |\n\+')
+
+
 def detect_rate_limit(content: str) -> dict | None:
     """
     Check if pane content shows a rate limit message.
@@ -104,52 +245,63 @@ def detect_rate_limit(content: str) -> dict | None:
     1. "Claude usage limit reached. Your limit will reset at 7pm (America/Chicago)."
     2. "You've hit your limit · resets 2am (America/Chicago)"
 
+    Only the last RATE_LIMIT_TAIL_CHARS characters are searched.
+
     Returns dict with reset info if found, None otherwise.
     """
-    content_lower = content.lower()
-
-    # Pattern 1: "Claude usage limit reached" format
-    pattern1 = (
-        r"claude\s+usage\s+limit\s+reached.*?"
-        r"limit\s+will\s+reset\s+at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)\s*(?:\(([^)]+)\))?"
-    )
+    if len(content) > RATE_LIMIT_TAIL_CHARS:
+        content = content[-RATE_LIMIT_TAIL_CHARS:]
 
-    # Pattern 2: "You've hit your limit · resets Xam/pm" format
-    pattern2 = (
-        r"you've\s+hit\s+your\s+limit\s*[·\-]\s*resets\s+"
-        r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)\s*(?:\(([^)]+)\))?"
-    )
+    # Both message formats contain "limit"; most panes don't, so skip the regexes
+    if not any(casing in content for casing in _LIMIT_CASINGS):
+        return None
 
-    match = None
-    for pattern in [pattern1, pattern2]:
-        match = re.search(pattern, content_lower, re.DOTALL)
-        if match:
-            break
+    with _detect_cache_lock:
+        if content in _detect_cache:
+            cached = _detect_cache[content]
+            # Copy, so callers can't alter the cached result
+            return dict(cached) if cached is not None else None
+
+    result = _match_rate_limit(content)
+    if DETECT_CACHE_SIZE > 0:
+        with _detect_cache_lock:
+            if len(_detect_cache) >= DETECT_CACHE_SIZE:
+                # Evict the oldest entry; dicts keep insertion order
+                del _detect_cache[next(iter(_detect_cache))]
+            _detect_cache[content] = result
+    return dict(result) if result is not None else None
+
+
+def _match_rate_limit(content: str) -> dict | None:
+    """Run the rate limit patterns over a pane tail already known to mention "limit"."""
+    lowered = content.lower()
+    # Both formats also contain "reset" ("reset at" / "resets"). A literal find
+    # is far cheaper than the pattern on panes that merely mention "limit"
+    if "reset" not in lowered:
+        return None
 
+    match = _RATE_LIMIT_RE.search(lowered)
     if not match:
         return None
 
     # Reject matches that appear to be from code, tests, or diffs
     # Look at context around the match for indicators
-    raw_match = match.group(0)
     start = max(0, match.start() - 50)
-    context = content_lower[start : match.end()]
-
-    # Code/diff indicators: quotes, assignment, diff markers
-    code_indicators = ['content = "', 'content="', '= "claude', '= "you', ">>> ", "... ", "\n+"]
-    if any(ind in context for ind in code_indicators):
+    if _CODE_INDICATOR_RE.search(lowered, start, match.end()):
         return None
 
     groups = match.groups()
-    hour = int(groups[0])
+    # 12-hour to 24-hour: 12am -> 0, 12pm -> 12
+    hour = int(groups[0]) % 12 + (12 if groups[2] == "pm" else 0)
     minute = int(groups[1]) if groups[1] else 0
-    ampm = groups[2]
-    timezone = groups[3] if len(groups) > 3 else None
+    timezone = groups[3]
 
-    if ampm == "pm" and hour != 12:
-        hour += 12
-    elif ampm == "am" and hour == 12:
-        hour = 0
+    # Report the original casing, as shown in the pane. Offsets only carry over
+    # when lowercasing kept the length (it can grow for a few characters like "İ")
+    if len(lowered) == len(content):
+        raw_match = content[match.start() : match.end()]
+    else:
+        raw_match = match.group(0)
 
     return {
         "reset_hour": hour,
@@ -159,21 +311,33 @@ def detect_rate_limit(content: str) -> dict | None:
     }
 
 
-def find_rate_limited_panes() -> list[TmuxPane]:
-    """Find all Claude panes that are showing rate limit messages."""
-    panes = get_claude_panes()
-    limited = []
-
+def _mark_rate_limited(panes: list[TmuxPane], contents: dict[str, str]) -> None:
+    """Set is_rate_limited/reset_info on each pane from its captured content."""
     for pane in panes:
-        content = capture_pane_content(pane.pane_id)
-        rate_info = detect_rate_limit(content)
+        rate_info = detect_rate_limit(contents[pane.pane_id])
 
         if rate_info:
             pane.is_rate_limited = True
             pane.reset_info = rate_info.get("raw_match")
-            limited.append(pane)
 
-    return limited
+
+def scan_claude_panes() -> list[TmuxPane]:
+    """
+    List all Claude panes with their rate limit status filled in.
+
+    One pane listing and one bulk capture, for callers that need both the
+    full list and which panes are limited.
+    """
+    panes = get_claude_panes()
+    if panes:
+        # One tmux invocation for every pane instead of a fork per pane
+        _mark_rate_limited(panes, capture_panes_bulk([pane.pane_id for pane in panes]))
+    return panes
+
+
+def find_rate_limited_panes() -> list[TmuxPane]:
+    """Find all Claude panes that are showing rate limit messages."""
+    return [pane for pane in scan_claude_panes() if pane.is_rate_limited]
 
 
 def send_continue(pane_id: str) -> bool:
@@ -201,8 +365,6 @@ def send_continue(pane_id: str) -> bool:
         )
 
         # Small delay to let the UI process
-        import time
-
         time.sleep(0.5)
 
         # Then send "continue" to resume the session
@@ -217,6 +379,96 @@ def send_continue(pane_id: str) -> bool:
         return False
 
 
+async def _run_tmux_async(*args: str, timeout: float = 5) -> tuple[int, str]:
+    """Run a tmux command without blocking the event loop.
+
+    Returns (returncode, stdout); returncode is -1 if tmux is missing or timed out.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "tmux",
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=_get_tmux_env(),
+        )
+    except FileNotFoundError:
+        return -1, ""
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return -1, ""
+    return proc.returncode or 0, stdout.decode(errors="replace")
+
+
+async def get_claude_panes_async() -> list[TmuxPane]:
+    """Async version of get_claude_panes(), for use inside an event loop."""
+    cached = _get_cached_panes()
+    if cached is not None:
+        return cached
+    returncode, stdout = await _run_tmux_async(*_LIST_PANES_ARGS)
+    panes = _parse_claude_panes(stdout) if returncode == 0 else []
+    _set_cached_panes(panes)
+    return panes
+
+
+async def capture_panes_bulk_async(pane_ids: list[str], lines: int = 100) -> dict[str, str]:
+    """Async version of capture_panes_bulk(); missing panes are retried concurrently."""
+    if not pane_ids:
+        return {}
+
+    returncode, stdout = await _run_tmux_async(*_bulk_capture_args(pane_ids, lines))
+    if returncode == -1:
+        return dict.fromkeys(pane_ids, "")
+
+    captured = _split_bulk_capture(stdout)
+    missing = [pane_id for pane_id in pane_ids if pane_id not in captured]
+    retries = await asyncio.gather(
+        *(
+            _run_tmux_async("capture-pane", "-t", pane_id, "-p", "-S", f"-{lines}")
+            for pane_id in missing
+        )
+    )
+    for pane_id, (returncode, stdout) in zip(missing, retries, strict=True):
+        captured[pane_id] = stdout if returncode == 0 else ""
+
+    return {pane_id: captured[pane_id] for pane_id in pane_ids}
+
+
+async def scan_claude_panes_async() -> list[TmuxPane]:
+    """Async version of scan_claude_panes()."""
+    panes = await get_claude_panes_async()
+    if panes:
+        contents = await capture_panes_bulk_async([pane.pane_id for pane in panes])
+        _mark_rate_limited(panes, contents)
+    return panes
+
+
+async def send_continue_async(pane_id: str) -> bool:
+    """Async version of send_continue(), for sending to many panes concurrently."""
+    await _run_tmux_async("send-keys", "-t", pane_id, "1", "Enter")
+    # Small delay to let the UI process
+    await asyncio.sleep(0.5)
+    returncode, _ = await _run_tmux_async("send-keys", "-t", pane_id, "continue", "Enter")
+    return returncode == 0
+
+
+def send_continue_many(pane_ids: list[str]) -> list[bool]:
+    """
+    Send the continue sequence to several panes concurrently.
+
+    The tmux subprocesses and the per-pane 0.5s pause overlap, so N panes
+    take about as long as one. Returns one success flag per pane ID, in order.
+    """
+
+    async def send_all() -> list[bool]:
+        return list(await asyncio.gather(*(send_continue_async(p) for p in pane_ids)))
+
+    return asyncio.run(send_all()) if pane_ids else []
+
+
 def is_pane_waiting_for_input(pane_id: str) -> bool:
     """
     Check if a pane appears to be waiting at a prompt.
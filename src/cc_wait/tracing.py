@@ -16,6 +16,8 @@ from opentelemetry.sdk.trace.export import BatchSpanProcessor
 SERVICE_NAME = "cc-wait"
 SERVICE_VERSION = "0.2.0"
 
+OTEL_ENABLED = os.environ.get("OTEL_ENABLED", "true").lower() in ("1", "true", "yes")
+
 _tracer: trace.Tracer | None = None
 
 
@@ -40,7 +42,6 @@ def setup_tracing(
 
     # Get endpoint from env or default
     endpoint = endpoint or os.environ.get("OTEL_EXPORTER_ENDPOINT", "http://localhost:4317")
-    otel_enabled = os.environ.get("OTEL_ENABLED", "true").lower() in ("1", "true", "yes")
 
     # Create resource with service info
     resource = Resource.create(
@@ -53,7 +54,7 @@ def setup_tracing(
     # Create tracer provider
     provider = TracerProvider(resource=resource)
 
-    if otel_enabled:
+    if OTEL_ENABLED:
         # Add OTLP exporter
         otlp_exporter = OTLPSpanExporter(
             endpoint=endpoint,
@@ -89,6 +90,11 @@ def create_span(
             result = fetch_data()
             span.set_attribute("result_count", len(result))
     """
+    if not OTEL_ENABLED:
+        # Nothing is exported, so skip span creation and context switching
+        yield trace.INVALID_SPAN
+        return
+
     tracer = get_tracer()
     with tracer.start_as_current_span(name, attributes=attributes) as span:
         yield span
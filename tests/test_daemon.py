@@ -0,0 +1,253 @@
+"""Tests for daemon module."""
+
+import io
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from cc_wait import daemon as daemon_module
+from cc_wait.daemon import (
+    _FORMAT1,
+    _FORMAT2,
+    _MENU_ITEM,
+    _UPGRADE,
+    _WAIT,
+    HIGH_UTILIZATION,
+    MAX_IDLE_INTERVAL,
+    MIN_POLL_INTERVAL,
+    RateLimitDaemon,
+    _scan_fallback_indicators,
+    _tail_lines,
+)
+from cc_wait.oauth import UsageStatus, UsageWindow
+from cc_wait.tmux import TmuxPane
+
+
+def _status(utilization: float, resets_at: datetime | None = None) -> UsageStatus:
+    return UsageStatus(
+        five_hour=UsageWindow(utilization=utilization, resets_at=resets_at),
+        seven_day=UsageWindow(utilization=10.0, resets_at=None),
+    )
+
+
+class TestNextSleep:
+    """Tests for the adaptive poll interval."""
+
+    def test_uses_poll_interval_before_first_status(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        assert daemon._next_sleep() == 60
+
+    def test_backs_off_while_idle(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(20.0)
+        assert daemon._next_sleep() == 60
+        assert daemon._next_sleep() == 120
+        assert daemon._next_sleep() == 240
+        assert daemon._next_sleep() == MAX_IDLE_INTERVAL
+        assert daemon._next_sleep() == MAX_IDLE_INTERVAL
+
+    def test_utilization_change_resets_backoff(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(20.0)
+        daemon._next_sleep()
+        daemon._next_sleep()
+        daemon.last_status = _status(25.0)
+        assert daemon._next_sleep() == 60
+        assert daemon._next_sleep() == 120
+
+    def test_no_backoff_at_high_utilization(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(HIGH_UTILIZATION)
+        assert daemon._next_sleep() == 60
+        assert daemon._next_sleep() == 60
+        assert daemon._next_sleep() == 60
+
+    def test_wakes_just_after_imminent_reset(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(100.0, datetime.now(UTC) + timedelta(seconds=20))
+        assert 19 <= daemon._next_sleep() <= 21
+
+    def test_polls_normally_when_reset_is_far(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(100.0, datetime.now(UTC) + timedelta(hours=2))
+        assert daemon._next_sleep() == 60
+
+    def test_uses_floor_when_reset_has_passed(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(100.0, datetime.now(UTC) - timedelta(seconds=30))
+        assert daemon._next_sleep() == MIN_POLL_INTERVAL
+
+    def test_backs_off_after_reset_has_passed(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(100.0, datetime.now(UTC) - timedelta(seconds=30))
+        sleeps = [daemon._next_sleep() for _ in range(6)]
+        assert sleeps == [5, 10, 20, 40, 60, 60]
+
+    def test_polls_normally_after_failed_fetch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(100.0, datetime.now(UTC) - timedelta(seconds=30))
+        monkeypatch.setattr(daemon_module, "fetch_usage_status", lambda: None)
+        daemon._check_and_handle()
+        assert daemon._next_sleep() == 60
+
+    def test_limit_resets_idle_backoff(self) -> None:
+        daemon = RateLimitDaemon(poll_interval=60)
+        daemon.last_status = _status(20.0)
+        daemon._next_sleep()
+        daemon._next_sleep()
+        daemon.last_status = _status(100.0)
+        daemon._next_sleep()
+        daemon.last_status = _status(20.0)
+        assert daemon._next_sleep() == 60
+
+
+class TestScanFallbackIndicators:
+    """Tests for the single-pass fallback indicator scan."""
+
+    def test_detects_hit_limit_with_menu(self) -> None:
+        text = (
+            "you've hit your limit · resets 2am\n"
+            " ❯ 1. stop and wait for limit to reset\n"
+            "   2. upgrade your plan"
+        )
+        flags = _scan_fallback_indicators(text)
+        assert flags & _FORMAT2 == _FORMAT2
+        assert flags & _MENU_ITEM
+        assert flags & _WAIT
+        assert flags & _UPGRADE
+
+    def test_detects_overlapping_needles(self) -> None:
+        flags = _scan_fallback_indicators("claude usage limit will reset at 7pm")
+        assert flags & _FORMAT1 == _FORMAT1
+
+    def test_no_flags_for_plain_output(self) -> None:
+        assert _scan_fallback_indicators("all tests passed") == 0
+
+
+class TestStrategy:
+    """Tests for continue strategy selection."""
+
+    def test_rejects_unknown_strategy(self) -> None:
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            RateLimitDaemon(strategy="sometimes")  # ty: ignore[invalid-argument-type]
+
+    def test_all_strategy_skips_capture(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        panes = [
+            TmuxPane(pane_id="%1", session_name="a", command="claude"),
+            TmuxPane(pane_id="%2", session_name="b", command="claude"),
+        ]
+        sent: list[str] = []
+
+        def fake_send(pane_ids: list[str]) -> list[bool]:
+            sent.extend(pane_ids)
+            return [True] * len(pane_ids)
+
+        monkeypatch.setattr(daemon_module, "get_claude_panes", lambda: panes)
+        monkeypatch.setattr(daemon_module, "send_continue_many", fake_send)
+
+        def no_capture(*args: object, **kwargs: object) -> dict[str, str]:
+            raise AssertionError("the 'all' strategy must not capture panes")
+
+        monkeypatch.setattr(daemon_module, "capture_panes_bulk", no_capture)
+
+        daemon = RateLimitDaemon(strategy="all")
+        daemon.continued_panes.add("%2")
+        daemon._continue_sessions()
+
+        assert sent == ["%1"]
+        assert daemon.continued_panes == {"%1", "%2"}
+
+
+class TestStop:
+    """Tests for stopping the daemon loop."""
+
+    def test_wait_stopped_times_out(self) -> None:
+        assert RateLimitDaemon().wait_stopped(0) is False
+
+    def test_wait_stopped_after_stop(self) -> None:
+        daemon = RateLimitDaemon()
+        daemon.stop()
+        assert daemon.wait_stopped(0) is True
+
+
+class TestTailLines:
+    """Tests for tail extraction without a full split."""
+
+    def test_returns_last_lines(self) -> None:
+        assert _tail_lines("a\nb\nc\nd", 2) == "c\nd"
+
+    def test_ignores_trailing_blank_lines(self) -> None:
+        # tmux pads captures with blank lines below the cursor
+        assert _tail_lines("a\nb\nc\n\n\n  \n", 2) == "b\nc"
+
+    def test_short_text_returned_whole(self) -> None:
+        assert _tail_lines("a\nb", 5) == "a\nb"
+
+    def test_empty(self) -> None:
+        assert _tail_lines("", 3) == ""
+
+
+class TestDebugLog:
+    """Tests for the debug log file."""
+
+    def test_rotates_past_size_cap(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        log_path = tmp_path / "cc-wait-daemon.log"
+        monkeypatch.setattr(daemon_module, "DEBUG_LOG_PATH", log_path)
+        monkeypatch.setattr(daemon_module, "DEBUG_LOG_MAX_BYTES", 50)
+        monkeypatch.setattr(daemon_module, "_debug_fp", None)
+
+        daemon_module.debug_log("x" * 60)
+        daemon_module.debug_log("after rotation")
+        daemon_module._close_debug_log()
+
+        assert "x" * 60 in (tmp_path / "cc-wait-daemon.log.1").read_text()
+        assert "after rotation" in log_path.read_text()
+        assert "x" * 60 not in log_path.read_text()
+
+
+class TestLog:
+    """Tests for stderr logging."""
+
+    def test_writes_timestamped_line(self, capfd: pytest.CaptureFixture[str]) -> None:
+        daemon_module.log("hello ✓")
+        err = capfd.readouterr().err
+        assert err.endswith("] hello ✓\n")
+        assert err.startswith("[")
+
+    def test_falls_back_without_buffer(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        stream = io.StringIO()
+        monkeypatch.setattr(daemon_module.sys, "stderr", stream)
+        daemon_module.log("plain")
+        assert stream.getvalue().endswith("] plain\n")
+
+
+class TestStatusFile:
+    """Tests for publishing daemon status to a file."""
+
+    def test_writes_status_json(self, tmp_path: Path) -> None:
+        status_path = tmp_path / "status.json"
+        daemon = RateLimitDaemon(poll_interval=60, status_path=status_path)
+        daemon.waiting_for_reset = True
+        daemon.continued_panes.update({"%2", "%1"})
+
+        daemon._write_status()
+
+        status = json.loads(status_path.read_text())
+        assert status["waiting_for_reset"] is True
+        assert status["continued_panes"] == ["%1", "%2"]
+        assert status["poll_interval"] == 60
+        assert not status_path.with_suffix(".tmp").exists()
+
+    def test_logs_first_write_failure_loudly(
+        self, tmp_path: Path, capfd: pytest.CaptureFixture[str]
+    ) -> None:
+        # A regular file where the directory should be makes the write fail, even as root
+        (tmp_path / "blocked").write_text("")
+        daemon = RateLimitDaemon(poll_interval=60, status_path=tmp_path / "blocked" / "s.json")
+
+        daemon._write_status()
+        daemon._write_status()
+
+        assert capfd.readouterr().err.count("Could not write status file") == 1
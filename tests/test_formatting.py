@@ -0,0 +1,24 @@
+"""Tests for formatting module."""
+
+from cc_wait.formatting import format_duration
+
+
+class TestFormatDuration:
+    """Tests for human-readable durations."""
+
+    def test_seconds(self) -> None:
+        assert format_duration(45) == "45s"
+
+    def test_minutes_drop_seconds(self) -> None:
+        assert format_duration(330) == "5m"
+
+    def test_precise_minutes_keep_seconds(self) -> None:
+        assert format_duration(330, precise=True) == "5m 30s"
+        assert format_duration(300, precise=True) == "5m"
+
+    def test_hours(self) -> None:
+        assert format_duration(3600) == "1h"
+        assert format_duration(5520) == "1h 32m"
+
+    def test_none(self) -> None:
+        assert format_duration(None) == "N/A"
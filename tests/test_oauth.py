@@ -1,8 +1,13 @@
 """Tests for OAuth module."""
 
+import dataclasses
 from datetime import UTC, datetime, timedelta
 
-from cc_wait.oauth import UsageStatus, UsageWindow, _parse_datetime
+import httpx
+import pytest
+
+from cc_wait import oauth
+from cc_wait.oauth import UsageStatus, UsageWindow, _parse_datetime, fetch_usage_status
 
 
 class TestParseDateTime:
@@ -18,6 +23,16 @@ class TestParseDateTime:
         assert result is not None
         assert result.hour == 22
 
+    def test_z_is_utc(self) -> None:
+        result = _parse_datetime("2026-01-17T22:05:09Z")
+        assert result == datetime(2026, 1, 17, 22, 5, 9, tzinfo=UTC)
+
+    def test_parses_fractional_seconds_with_z(self) -> None:
+        result = _parse_datetime("2026-01-17T22:00:00.581357Z")
+        assert result is not None
+        assert result.microsecond == 581357
+        assert result.utcoffset() == timedelta(0)
+
     def test_returns_none_for_invalid(self) -> None:
         result = _parse_datetime("not a date")
         assert result is None
@@ -42,6 +57,13 @@ class TestUsageWindow:
         window = UsageWindow(utilization=99.9, resets_at=None)
         assert window.is_limited is False
 
+    def test_is_limited_cached_on_frozen_window(self) -> None:
+        window = UsageWindow(utilization=100.0, resets_at=None)
+        assert window.is_limited is True
+        assert window.__dict__["is_limited"] is True
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            window.utilization = 0.0  # ty: ignore[invalid-assignment]
+
     def test_resets_in_seconds(self) -> None:
         future = datetime.now(UTC) + timedelta(hours=1)
         window = UsageWindow(utilization=50.0, resets_at=future)
@@ -49,6 +71,12 @@ class TestUsageWindow:
         assert seconds is not None
         assert 3500 <= seconds <= 3700  # ~1 hour
 
+    def test_seconds_until_reset_uses_given_now(self) -> None:
+        now = datetime(2026, 1, 17, 20, 0, tzinfo=UTC)
+        window = UsageWindow(utilization=50.0, resets_at=now + timedelta(minutes=90))
+        assert window.seconds_until_reset(now) == 5400
+        assert window.seconds_until_reset(now + timedelta(hours=2)) == 0
+
     def test_resets_in_seconds_none_when_no_reset_time(self) -> None:
         window = UsageWindow(utilization=50.0, resets_at=None)
         assert window.resets_in_seconds is None
@@ -87,3 +115,52 @@ class TestUsageStatus:
             seven_day=UsageWindow(utilization=100.0, resets_at=late),
         )
         assert status.next_reset == early
+
+    def test_next_reset_ignores_unlimited_windows(self) -> None:
+        early = datetime.now(UTC) + timedelta(hours=1)
+        late = datetime.now(UTC) + timedelta(hours=5)
+
+        status = UsageStatus(
+            five_hour=UsageWindow(utilization=50.0, resets_at=early),
+            seven_day=UsageWindow(utilization=100.0, resets_at=late),
+        )
+        assert status.next_reset == late
+
+    def test_next_reset_none_when_not_limited(self) -> None:
+        status = UsageStatus(
+            five_hour=UsageWindow(utilization=50.0, resets_at=datetime.now(UTC)),
+            seven_day=UsageWindow(utilization=50.0, resets_at=None),
+        )
+        assert status.next_reset is None
+
+
+class TestFetchUsageStatus:
+    """Tests for the usage API client."""
+
+    def test_reuses_shared_client(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"five_hour": {"utilization": 42}, "seven_day": {}})
+
+        client = httpx.Client(
+            transport=httpx.MockTransport(handler),
+            headers={"anthropic-beta": "oauth-2025-04-20"},
+        )
+        monkeypatch.setattr(oauth, "_client", client)
+
+        first = fetch_usage_status(token="abc")
+        second = fetch_usage_status(token="abc")
+
+        assert first is not None and second is not None
+        assert first.five_hour.utilization == 42.0
+        assert oauth._get_client() is client
+        assert len(requests) == 2
+        assert requests[0].headers["authorization"] == "Bearer abc"
+        assert requests[0].headers["anthropic-beta"] == "oauth-2025-04-20"
+
+    def test_returns_none_on_http_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        client = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(500)))
+        monkeypatch.setattr(oauth, "_client", client)
+        assert fetch_usage_status(token="abc") is None
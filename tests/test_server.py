@@ -0,0 +1,192 @@
+"""Tests for server module."""
+
+import asyncio
+import fcntl
+import json
+import os
+import subprocess
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from cc_wait import server, tracing
+
+
+class TestAcquireDaemonLock:
+    """Tests for electing the one worker that runs the daemon."""
+
+    @pytest.fixture(autouse=True)
+    def lock_path(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[Path]:
+        path = tmp_path / "run" / "daemon.lock"
+        monkeypatch.setattr(server, "DAEMON_LOCK_PATH", path)
+        monkeypatch.setattr(server, "_daemon_lock_fp", None)
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+        yield path
+        if server._daemon_lock_fp is not None:
+            server._daemon_lock_fp.close()
+
+    def test_acquires_free_lock(self, lock_path: Path) -> None:
+        assert server._acquire_daemon_lock() is True
+        assert lock_path.exists()
+        assert server._daemon_lock_fp is not None
+
+    def test_fails_when_lock_is_held(self, lock_path: Path) -> None:
+        lock_path.parent.mkdir(parents=True)
+        with open(lock_path, "a") as holder:
+            fcntl.flock(holder, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            assert server._acquire_daemon_lock() is False
+        assert server._daemon_lock_fp is None
+
+    def test_unwritable_dir_runs_daemon_with_one_worker(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        # A regular file where the directory should be makes mkdir fail, even as root
+        (tmp_path / "blocked").write_text("")
+        monkeypatch.setattr(server, "DAEMON_LOCK_PATH", tmp_path / "blocked" / "daemon.lock")
+        assert server._acquire_daemon_lock() is True
+
+    def test_unwritable_dir_skips_daemon_with_several_workers(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        (tmp_path / "blocked").write_text("")
+        monkeypatch.setattr(server, "DAEMON_LOCK_PATH", tmp_path / "blocked" / "daemon.lock")
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        assert server._acquire_daemon_lock() is False
+        assert "auto-continue is DISABLED" in capsys.readouterr().err
+
+
+class TestMain:
+    """Tests for the server command line."""
+
+    @pytest.fixture
+    def run_calls(self, monkeypatch: pytest.MonkeyPatch) -> list[dict]:
+        calls: list[dict] = []
+        monkeypatch.setattr(server.uvicorn, "run", lambda app, **kwargs: calls.append(kwargs))
+        return calls
+
+    def test_invalid_web_concurrency_falls_back_to_one_worker(
+        self, monkeypatch: pytest.MonkeyPatch, run_calls: list[dict]
+    ) -> None:
+        monkeypatch.setenv("WEB_CONCURRENCY", "auto")
+        monkeypatch.setattr("sys.argv", ["cc-wait-server"])
+        server.main()
+        assert run_calls[0]["workers"] == 1
+        assert os.environ["WEB_CONCURRENCY"] == "1"
+
+    def test_help_with_invalid_web_concurrency(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("WEB_CONCURRENCY", "auto")
+        monkeypatch.setattr("sys.argv", ["cc-wait-server", "--help"])
+        with pytest.raises(SystemExit) as exc_info:
+            server.main()
+        assert exc_info.value.code == 0
+
+
+def _write_status(path: Path, *, pid: int, waiting: bool = False) -> None:
+    path.write_text(
+        json.dumps(
+            {"pid": pid, "waiting_for_reset": waiting, "continued_panes": [], "poll_interval": 60}
+        )
+    )
+
+
+class TestReadDaemonStatus:
+    """Tests for reading the daemon process's published status."""
+
+    @pytest.fixture(autouse=True)
+    def status_path(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+        path = tmp_path / "status.json"
+        monkeypatch.setattr(server, "DAEMON_STATUS_PATH", path)
+        return path
+
+    def test_reads_live_daemon_status(self, status_path: Path) -> None:
+        _write_status(status_path, pid=os.getpid(), waiting=True)
+        status = server._read_daemon_status()
+        assert status is not None
+        assert status["waiting_for_reset"] is True
+
+    def test_none_when_file_missing(self) -> None:
+        assert server._read_daemon_status() is None
+
+    def test_none_for_stale_pid(self, status_path: Path) -> None:
+        dead = subprocess.Popen(["true"])
+        dead.wait()
+        _write_status(status_path, pid=dead.pid)
+        assert server._read_daemon_status() is None
+
+    def test_none_for_corrupt_file(self, status_path: Path) -> None:
+        status_path.write_text("{not json")
+        assert server._read_daemon_status() is None
+
+
+class TestGetCachedResponse:
+    """Tests for the response cache and its daemon status check."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+        path = tmp_path / "status.json"
+        monkeypatch.setattr(server, "DAEMON_STATUS_PATH", path)
+        monkeypatch.setattr(server, "_response_cache", {})
+        monkeypatch.setattr(server, "_cached_waiting_for_reset", False)
+        monkeypatch.setattr(server, "_daemon_status_checked_at", float("-inf"))
+        return path
+
+    def test_hit_within_ttl(self) -> None:
+        server._response_cache["usage"] = (time.monotonic(), b"{}")
+        assert server._get_cached_response("usage") == b"{}"
+
+    def test_expired_entry_is_a_miss(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(server, "RESPONSE_CACHE_TTL", 0.0)
+        server._response_cache["usage"] = (time.monotonic(), b"{}")
+        assert server._get_cached_response("usage") is None
+
+    def test_status_read_at_most_once_per_interval(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        reads: list[int] = []
+        monkeypatch.setattr(server, "_read_daemon_status", lambda: reads.append(1))
+        server._response_cache["usage"] = (time.monotonic(), b"{}")
+        for _ in range(3):
+            assert server._get_cached_response("usage") == b"{}"
+        assert len(reads) == 1
+
+    def test_waiting_flip_drops_cache(self, fresh_cache: Path) -> None:
+        server._response_cache["usage"] = (time.monotonic(), b"{}")
+        _write_status(fresh_cache, pid=os.getpid(), waiting=True)
+        assert server._get_cached_response("usage") is None
+        assert server._cached_waiting_for_reset is True
+
+
+class TestStreamDashboard:
+    """Tests for streaming the dashboard page on a cache miss."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(server, "_response_cache", {})
+        monkeypatch.setattr(server, "_read_daemon_status", lambda: None)
+        # Spans would otherwise start the OTLP exporter
+        monkeypatch.setattr(tracing, "OTEL_ENABLED", False)
+
+    @staticmethod
+    def _collect() -> str:
+        async def collect() -> str:
+            return "".join([chunk async for chunk in server._stream_dashboard()])
+
+        return asyncio.run(collect())
+
+    def test_failure_still_closes_document(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        async def fetch_usage() -> None:
+            return None
+
+        async def get_sessions() -> list:
+            raise RuntimeError("tmux exploded")
+
+        monkeypatch.setattr(server, "_fetch_usage", fetch_usage)
+        monkeypatch.setattr(server, "_get_sessions", get_sessions)
+        body = self._collect()
+        assert body.startswith(server._PAGE_PREFIX)
+        assert body.endswith(server._PAGE_SUFFIX)
+        assert "tmux exploded" in body
+        assert "dashboard" not in server._response_cache
@@ -1,6 +1,13 @@
 """Tests for tmux module."""
 
-from cc_wait.tmux import detect_rate_limit
+import asyncio
+import subprocess
+from collections.abc import Iterator
+
+import pytest
+
+from cc_wait import tmux
+from cc_wait.tmux import capture_panes_bulk, detect_rate_limit
 
 
 class TestDetectRateLimit:
@@ -39,6 +46,13 @@ class TestDetectRateLimit:
         assert result is not None
         assert result["reset_hour"] == 0
 
+    def test_detects_uppercase_message(self) -> None:
+        content = "CLAUDE USAGE LIMIT REACHED. YOUR LIMIT WILL RESET AT 7PM (AMERICA/CHICAGO)."
+        result = detect_rate_limit(content)
+        assert result is not None
+        assert result["reset_hour"] == 19
+        assert result["timezone"] == "america/chicago"
+
     def test_returns_none_for_no_match(self) -> None:
         content = "Normal output without any rate limit messages"
         result = detect_rate_limit(content)
@@ -69,6 +83,10 @@ class TestDetectRateLimit:
         result = detect_rate_limit(content)
         assert result is None
 
+    def test_ignores_repl_echo(self) -> None:
+        content = '>>> detect_rate_limit("You\'ve hit your limit · resets 2am")'
+        assert detect_rate_limit(content) is None
+
     def test_handles_ansi_escape_codes(self) -> None:
         # ANSI codes typically wrap the whole message, not break up words
         content = "\x1b[31mClaude usage limit reached. Your limit will reset at 7pm\x1b[0m"
@@ -82,6 +100,32 @@ class TestDetectRateLimit:
         assert result is not None
         assert result["timezone"] == "america/chicago"  # lowercase from regex
 
+    def test_raw_match_keeps_original_case(self) -> None:
+        content = "You've hit your limit · resets 2am (America/Chicago)"
+        result = detect_rate_limit(content)
+        assert result is not None
+        assert result["raw_match"] == content
+
+    def test_returns_none_for_limit_without_reset(self) -> None:
+        assert detect_rate_limit("Claude usage limit reached. Try again later.") is None
+
+    def test_finds_banner_at_end_of_long_capture(self) -> None:
+        content = "output line\n" * 2000 + "You've hit your limit · resets 2am\n\n\n"
+        result = detect_rate_limit(content)
+        assert result is not None
+        assert result["reset_hour"] == 2
+
+    def test_ignores_banner_above_search_tail(self) -> None:
+        content = "You've hit your limit · resets 2am\n" + "output line\n" * 2000
+        assert detect_rate_limit(content) is None
+
+    def test_raw_match_when_lowercasing_changes_length(self) -> None:
+        # "İ".lower() is two characters, so offsets no longer line up
+        content = "İstanbul build\nYou've hit your limit · resets 2am"
+        result = detect_rate_limit(content)
+        assert result is not None
+        assert result["raw_match"] == "you've hit your limit · resets 2am"
+
     def test_handles_multiline_message(self) -> None:
         # The message might span lines in some terminals
         content = "Claude usage limit reached.\nYour limit will reset at 7pm (America/Chicago)."
@@ -130,3 +174,213 @@ class TestDetectRateLimit:
         result = detect_rate_limit(content)
         assert result is not None
         assert result["reset_hour"] == 2
+
+
+class TestDetectRateLimitCache:
+    """Tests for reusing detection results for unchanged panes."""
+
+    @pytest.fixture
+    def match_calls(self, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+        calls: list[str] = []
+        real_match = tmux._match_rate_limit
+
+        def counting_match(content: str) -> dict | None:
+            calls.append(content)
+            return real_match(content)
+
+        monkeypatch.setattr(tmux, "_match_rate_limit", counting_match)
+        monkeypatch.setattr(tmux, "_detect_cache", {})
+        return calls
+
+    def test_unchanged_pane_is_not_rescanned(self, match_calls: list[str]) -> None:
+        content = "You've hit your limit · resets 2am"
+        first = detect_rate_limit(content)
+        assert first is not None
+        first["reset_hour"] = 99
+
+        second = detect_rate_limit(content)
+        assert len(match_calls) == 1
+        # Callers get their own copy of the cached result
+        assert second is not None and second["reset_hour"] == 2
+
+    def test_evicts_oldest_entry(
+        self, match_calls: list[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(tmux, "DETECT_CACHE_SIZE", 2)
+        for text in ("limit a", "limit b", "limit c"):
+            detect_rate_limit(text)
+        assert list(tmux._detect_cache) == ["limit b", "limit c"]
+
+
+class TestGetTmuxEnv:
+    """Tests for the cached tmux subprocess environment."""
+
+    @pytest.fixture(autouse=True)
+    def rebuild_env(self) -> Iterator[None]:
+        yield
+        tmux._get_tmux_env(refresh=True)
+
+    def test_reuses_cached_env(self) -> None:
+        assert tmux._get_tmux_env() is tmux._get_tmux_env()
+
+    def test_refresh_picks_up_changes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TMUX_TMPDIR", "/tmp/cc-wait-test")
+        assert tmux._get_tmux_env(refresh=True)["TMUX_TMPDIR"] == "/tmp/cc-wait-test"
+        monkeypatch.delenv("TMUX_TMPDIR")
+        assert "TMUX_TMPDIR" not in tmux._get_tmux_env(refresh=True)
+
+
+class TestGetClaudePanesCache:
+    """Tests for the short-lived pane listing cache."""
+
+    @pytest.fixture
+    def list_calls(self, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+        calls: list[int] = []
+
+        def fake_list() -> list[tmux.TmuxPane]:
+            calls.append(1)
+            return [tmux.TmuxPane(pane_id="%1", session_name="a", command="claude")]
+
+        monkeypatch.setattr(tmux, "_list_claude_panes", fake_list)
+        monkeypatch.setattr(tmux, "_panes_cache", None)
+        return calls
+
+    def test_reuses_listing_within_ttl(self, list_calls: list[int]) -> None:
+        first = tmux.get_claude_panes()
+        first[0].is_rate_limited = True
+        second = tmux.get_claude_panes()
+
+        assert len(list_calls) == 1
+        # Callers get their own copies to mark up
+        assert second[0].is_rate_limited is False
+
+    def test_relists_after_ttl(
+        self, list_calls: list[int], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(tmux, "PANES_CACHE_TTL", 0.0)
+        tmux.get_claude_panes()
+        tmux.get_claude_panes()
+        assert len(list_calls) == 2
+
+
+class TestCapturePanesBulk:
+    """Tests for single-invocation pane capture."""
+
+    def test_splits_output_per_pane(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        stdout = "__cc_wait_capture__ %1\nfirst\npane\n__cc_wait_capture__ %2\nsecond\n"
+        calls: list[list[str]] = []
+
+        def fake_run(args: list[str], **kwargs: object) -> subprocess.CompletedProcess:
+            calls.append(args)
+            return subprocess.CompletedProcess(args, 0, stdout=stdout, stderr="")
+
+        monkeypatch.setattr(tmux.subprocess, "run", fake_run)
+        result = capture_panes_bulk(["%1", "%2"], lines=10)
+
+        assert result == {"%1": "first\npane\n", "%2": "second\n"}
+        assert len(calls) == 1
+
+    def test_falls_back_for_missing_panes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # tmux aborts the chain when a pane has disappeared
+        stdout = "__cc_wait_capture__ %1\nfirst\n"
+
+        def fake_run(args: list[str], **kwargs: object) -> subprocess.CompletedProcess:
+            return subprocess.CompletedProcess(args, 1, stdout=stdout, stderr="")
+
+        monkeypatch.setattr(tmux.subprocess, "run", fake_run)
+        monkeypatch.setattr(
+            tmux, "capture_pane_content", lambda pane_id, lines: f"single {pane_id}"
+        )
+        result = capture_panes_bulk(["%1", "%2"], lines=10)
+
+        assert result == {"%1": "first\n", "%2": "single %2"}
+
+    def test_empty_input_runs_nothing(self) -> None:
+        assert capture_panes_bulk([]) == {}
+
+    def test_async_retries_missing_panes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        async def fake_run(*args: str, timeout: float = 5) -> tuple[int, str]:
+            if args[0] == "display-message":
+                return 1, "__cc_wait_capture__ %1\nfirst\n"
+            return 0, f"single {args[2]}"
+
+        monkeypatch.setattr(tmux, "_run_tmux_async", fake_run)
+        result = asyncio.run(tmux.capture_panes_bulk_async(["%1", "%2"], lines=10))
+
+        assert result == {"%1": "first\n", "%2": "single %2"}
+
+
+class TestFindRateLimitedPanes:
+    """Tests for scanning Claude panes for rate limit messages."""
+
+    def test_marks_limited_panes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        panes = [
+            tmux.TmuxPane(pane_id="%1", session_name="a", command="claude"),
+            tmux.TmuxPane(pane_id="%2", session_name="b", command="claude"),
+        ]
+        contents = {
+            "%1": "all tests passed",
+            "%2": "You've hit your limit · resets 2am (America/Chicago)",
+        }
+        monkeypatch.setattr(tmux, "get_claude_panes", lambda: panes)
+        captured: list[list[str]] = []
+
+        def fake_bulk(pane_ids: list[str], lines: int = 100) -> dict[str, str]:
+            captured.append(pane_ids)
+            return {pane_id: contents[pane_id] for pane_id in pane_ids}
+
+        monkeypatch.setattr(tmux, "capture_panes_bulk", fake_bulk)
+
+        limited = tmux.find_rate_limited_panes()
+
+        assert captured == [["%1", "%2"]]
+
+        assert [pane.pane_id for pane in limited] == ["%2"]
+        assert limited[0].is_rate_limited
+        assert limited[0].reset_info is not None
+
+    def test_scan_returns_all_panes_marked(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        panes = [
+            tmux.TmuxPane(pane_id="%1", session_name="a", command="claude"),
+            tmux.TmuxPane(pane_id="%2", session_name="b", command="claude"),
+        ]
+        contents = {"%1": "ok", "%2": "You've hit your limit · resets 2am"}
+        monkeypatch.setattr(tmux, "get_claude_panes", lambda: panes)
+        monkeypatch.setattr(tmux, "capture_panes_bulk", lambda pane_ids, lines=100: contents)
+
+        scanned = tmux.scan_claude_panes()
+
+        assert [(pane.pane_id, pane.is_rate_limited) for pane in scanned] == [
+            ("%1", False),
+            ("%2", True),
+        ]
+
+    def test_no_panes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(tmux, "get_claude_panes", lambda: [])
+        assert tmux.find_rate_limited_panes() == []
+
+
+class TestSendContinueMany:
+    """Tests for concurrent continue sending."""
+
+    def test_sends_to_panes_concurrently(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls: list[tuple[str, ...]] = []
+
+        async def fake_run(*args: str, timeout: float = 5) -> tuple[int, str]:
+            calls.append(args)
+            return (1 if args[2] == "%bad" else 0), ""
+
+        real_sleep = tmux.asyncio.sleep
+
+        async def short_sleep(delay: float) -> None:
+            await real_sleep(0)
+
+        monkeypatch.setattr(tmux, "_run_tmux_async", fake_run)
+        monkeypatch.setattr(tmux.asyncio, "sleep", short_sleep)
+
+        assert tmux.send_continue_many(["%1", "%bad"]) == [True, False]
+        # Both panes get their menu key before either pause ends
+        assert [c[3] for c in calls] == ["1", "1", "continue", "continue"]
+
+    def test_no_panes(self) -> None:
+        assert tmux.send_continue_many([]) == []